@@ -0,0 +1,244 @@
+import csv
+import platform
+import random
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Literal
+
+from sqlmodel import Session
+
+from synda.config.storage import StorageConfig
+from synda.database import configure_storage, get_engine, get_storage, init_db
+from synda.model.node import Node
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "zen", "dar", "pel", "qua"]
+
+# Words labelled by the metadata step, drawn from the most frequent ones
+MATCHED_WORDS = 3
+
+
+class Benchmark:
+    """
+    Non-LLM throughput of synda on a synthetic corpus: ingestion, splitting,
+    deduplication, metadata extraction, prompt building and output writing,
+    run by the real executors against a scratch database.
+
+    Memory is the peak RSS of the whole process, which no stage can lower:
+    each stage reports it along with how much the stage raised it.
+    """
+
+    def __init__(
+        self,
+        rows: int,
+        words: int,
+        duplicates: float = 0.1,
+        dedup: Literal["exact", "fuzzy"] = "fuzzy",
+        seed: int = 0,
+    ):
+        self.rows = rows
+        self.words = words
+        self.duplicates = duplicates
+        self.dedup = dedup
+        self.seed = seed
+        self.stages: list[dict[str, Any]] = []
+
+    def run(self) -> dict[str, Any]:
+        previous_storage = get_storage()
+
+        with tempfile.TemporaryDirectory(prefix="synda-bench-") as scratch_dir:
+            scratch_dir = Path(scratch_dir)
+            configure_storage(StorageConfig(path=scratch_dir / "bench.db"))
+            try:
+                init_db()
+                started = time.perf_counter()
+                self._run_stages(scratch_dir)
+                total_seconds = time.perf_counter() - started
+            finally:
+                configure_storage(previous_storage)
+
+        return {
+            "synda_version": _synda_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {
+                "rows": self.rows,
+                "words": self.words,
+                "duplicates": self.duplicates,
+                "dedup": self.dedup,
+                "seed": self.seed,
+            },
+            "total_seconds": round(total_seconds, 3),
+            "process_peak_rss_mb": _peak_rss_mb(),
+            "stages": self.stages,
+        }
+
+    def _run_stages(self, scratch_dir: Path) -> None:
+        from synda.config import Config
+        from synda.model.run import Run
+        from synda.utils.prompt_builder import PromptBuilder
+
+        with self._stage("corpus", 0) as stage:
+            input_path = scratch_dir / "corpus.csv"
+            stage["rows_out"] = self._write_corpus(input_path)
+
+        config = Config.model_validate(
+            self._pipeline_config(input_path, scratch_dir / "output.csv")
+        )
+        session = Session(get_engine(), expire_on_commit=False)
+        run = Run.create_with_steps(session, config)
+
+        with self._stage("ingestion", self.rows) as stage:
+            nodes = config.input.load_nodes(session)
+            stage["rows_out"] = len(nodes)
+
+        for step in run.steps:
+            # Executors import their dependencies lazily, count it in the step
+            with self._stage(step.name, len(nodes)) as stage:
+                executor = step.get_step_config().get_executor(session, run, step)
+                executor.progress.disable()
+                nodes = executor.execute_and_update_step(nodes, [])
+                stage["rows_out"] = len(nodes)
+
+        with self._stage("prompt_building", len(nodes)) as stage:
+            prompts = PromptBuilder.build(
+                session, "Document: {chunk}\nSentence: {sentence}\nQuestion:", nodes
+            )
+            stage["rows_out"] = len(prompts)
+
+        with self._stage("output", len(nodes)) as stage:
+            config.output.save_output(nodes)
+            stage["rows_out"] = len(nodes)
+
+        session.close()
+
+    @contextmanager
+    def _stage(self, name: str, rows_in: int):
+        stage = {"name": name, "rows_in": rows_in, "rows_out": 0}
+        peak_before = _peak_rss_mb()
+        started = time.perf_counter()
+        yield stage
+
+        seconds = time.perf_counter() - started
+        rows = max(rows_in, stage["rows_out"])
+        peak_after = _peak_rss_mb()
+        stage |= {
+            "seconds": round(seconds, 4),
+            "rows_per_second": round(rows / seconds, 1) if seconds > 0 else None,
+            "process_peak_rss_mb": peak_after,
+            "peak_rss_increase_mb": (
+                round(peak_after - peak_before, 1) if peak_after is not None else None
+            ),
+        }
+        self.stages.append(stage)
+
+    def _pipeline_config(self, input_path: Path, output_path: Path) -> dict:
+        return {
+            "input": {
+                "format": "csv",
+                "path": str(input_path),
+                "target_column": "content",
+                "separator": ",",
+            },
+            "pipeline": [
+                {
+                    "type": "split",
+                    "method": "chunk",
+                    "name": "chunk",
+                    "parameters": {"size": 1000, "overlap": 100},
+                },
+                {
+                    "type": "split",
+                    "method": "separator",
+                    "name": "sentence",
+                    "parameters": {"separator": ".", "mode": "sentence"},
+                },
+                {
+                    "type": "clean",
+                    "method": "deduplicate-tf-idf",
+                    "name": "deduplicate",
+                    "parameters": {"strategy": self.dedup},
+                },
+                {
+                    "type": "metadata",
+                    "method": "word-position",
+                    "name": "word_position",
+                    "parameters": {
+                        "matches": {
+                            word.upper(): word
+                            for word in self._vocabulary()[:MATCHED_WORDS]
+                        },
+                        "occurrences": "all",
+                    },
+                },
+            ],
+            "output": {
+                "format": "csv",
+                "path": str(output_path),
+                "columns": ["value", "metadata"],
+            },
+        }
+
+    def _write_corpus(self, path: Path) -> int:
+        """
+        `rows` documents of about `words` Zipf-distributed words each, a
+        `duplicates` share of them repeating an earlier document
+        """
+        rng = random.Random(self.seed)
+        vocabulary = self._vocabulary()
+        weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+        documents: list[str] = []
+
+        for _ in range(self.rows):
+            if documents and rng.random() < self.duplicates:
+                documents.append(rng.choice(documents))
+                continue
+
+            sentences, remaining_words = [], self.words
+            while remaining_words > 0:
+                length = min(rng.randint(6, 24), remaining_words)
+                words = rng.choices(vocabulary, weights, k=length)
+                sentences.append(" ".join(words).capitalize() + ".")
+                remaining_words -= length
+            documents.append(" ".join(sentences))
+
+        with path.open("w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["content"])
+            writer.writerows([document] for document in documents)
+
+        return len(documents)
+
+    def _vocabulary(self) -> list[str]:
+        rng = random.Random(self.seed)
+        return list(
+            dict.fromkeys(
+                "".join(rng.choices(SYLLABLES, k=rng.randint(1, 4)))
+                for _ in range(5_000)
+            )
+        )
+
+
+def _synda_version() -> str:
+    try:
+        return version("synda")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def _peak_rss_mb() -> float | None:
+    """
+    Peak resident set size of the process so far
+    """
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
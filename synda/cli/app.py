@@ -1,9 +1,10 @@
 import typer
 from dotenv import load_dotenv
 
-from synda.database import init_db
+from synda.cli.bench import bench_command
 from synda.cli.provider import provider_command
 from synda.cli.generate import generate_command
+from synda.cli.stats import stats_command
 
 
 app = typer.Typer(
@@ -14,9 +15,10 @@ app = typer.Typer(
 
 app.command("provider")(provider_command)
 app.command("generate")(generate_command)
+app.command("stats")(stats_command)
+app.command("bench")(bench_command)
 
 
 def main():
     load_dotenv()
-    init_db()
     app()
@@ -0,0 +1,37 @@
+import json
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+
+def bench_command(
+    rows: int = typer.Option(
+        2_000, "--rows", min=1, help="Documents in the synthetic corpus"
+    ),
+    words: int = typer.Option(200, "--words", min=1, help="Words per document"),
+    duplicates: float = typer.Option(
+        0.1, "--duplicates", min=0, max=1, help="Share of repeated documents"
+    ),
+    dedup: str = typer.Option(
+        "fuzzy", "--dedup", help="Deduplication strategy: exact or fuzzy"
+    ),
+    seed: int = typer.Option(0, "--seed", help="Seed of the synthetic corpus"),
+    output: Optional[Path] = typer.Option(
+        None, "-o", help="Write the JSON report to a file instead of stdout"
+    ),
+) -> None:
+    """Measure the non-LLM throughput of synda on a synthetic corpus."""
+    from synda.benchmark import Benchmark
+
+    if dedup not in ("exact", "fuzzy"):
+        typer.secho("--dedup must be 'exact' or 'fuzzy'", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    report = Benchmark(rows, words, duplicates, dedup, seed).run()
+    report_json = json.dumps(report, indent=2)
+
+    if output is None:
+        typer.echo(report_json)
+    else:
+        output.write_text(report_json + "\n", encoding="utf-8")
@@ -3,9 +3,6 @@ from typing import Optional
 
 import typer
 
-from synda.config import Config
-from synda.pipeline import Pipeline
-
 
 def generate_command(
     config_file: Path = typer.Argument(
@@ -24,6 +21,12 @@ def generate_command(
     ),
 ) -> None:
     """Run a pipeline with provided configuration."""
+    # Steps and their dependencies are only loaded when a pipeline runs
+    from synda.config import Config
+    from synda.database import init_db
+    from synda.pipeline import Pipeline
+
+    init_db()
     if retry:
         Pipeline().retry()
     elif run_id is not None:
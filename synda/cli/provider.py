@@ -1,9 +1,6 @@
 from enum import Enum
 
 import typer
-from sqlalchemy.exc import IntegrityError, NoResultFound
-
-from synda.model.provider import Provider
 
 
 class ProviderAction(str, Enum):
@@ -12,9 +9,19 @@ class ProviderAction(str, Enum):
     UPDATE = "update"
 
 
-def add_provider(name: str, api_key: str | None, api_url: str | None) -> None:
+def add_provider(
+    name: str,
+    api_key: str | None,
+    api_url: str | None,
+    rpm: int | None,
+    tpm: int | None,
+) -> None:
+    from sqlalchemy.exc import IntegrityError
+
+    from synda.model.provider import Provider
+
     try:
-        Provider.create(name=name, api_key=api_key, api_url=api_url)
+        Provider.create(name=name, api_key=api_key, api_url=api_url, rpm=rpm, tpm=tpm)
         typer.secho(f"Successfully added provider: {name}", fg=typer.colors.GREEN)
     except IntegrityError:
         typer.secho(f"Provider {name} already exists", fg=typer.colors.YELLOW)
@@ -22,6 +29,10 @@ def add_provider(name: str, api_key: str | None, api_url: str | None) -> None:
 
 
 def delete_provider(name: str) -> None:
+    from sqlalchemy.exc import NoResultFound
+
+    from synda.model.provider import Provider
+
     try:
         provider = Provider.get(name)
         provider.delete()
@@ -35,20 +46,30 @@ def delete_provider(name: str) -> None:
         raise typer.Exit(1)
 
 
-def update_provider(name: str, api_key: str, api_url: str) -> None:
-    if api_key is None and api_url is None:
+def update_provider(
+    name: str, api_key: str, api_url: str, rpm: int | None, tpm: int | None
+) -> None:
+    if api_key is None and api_url is None and rpm is None and tpm is None:
         typer.secho(
-            "API key or API url is required for updating a provider",
+            "API key, API url, RPM or TPM is required for updating a provider",
             fg=typer.colors.RED,
         )
         raise typer.Exit(1)
 
+    from sqlalchemy.exc import NoResultFound
+
+    from synda.model.provider import Provider
+
     try:
         provider = Provider.get(name)
         if api_key is not None:
             provider.update(api_key=api_key)
         if api_url is not None:
             provider.update(api_url=api_url)
+        if rpm is not None:
+            provider.update(rpm=rpm)
+        if tpm is not None:
+            provider.update(tpm=tpm)
         typer.secho(f"Successfully updated provider: {name}", fg=typer.colors.GREEN)
     except NoResultFound:
         typer.secho(f"Provider {name} not found", fg=typer.colors.RED)
@@ -66,11 +87,20 @@ def provider_command(
         help="API key for model provider",
     ),
     api_url: str = typer.Option(None, "-k", help="API url to call for model provider"),
+    rpm: int = typer.Option(
+        None, "--rpm", min=1, help="Maximum requests per minute sent to the provider"
+    ),
+    tpm: int = typer.Option(
+        None, "--tpm", min=1, help="Maximum tokens per minute sent to the provider"
+    ),
 ) -> None:
+    from synda.database import init_db
+
+    init_db()
     match action:
         case ProviderAction.ADD:
-            add_provider(model_provider, api_key, api_url)
+            add_provider(model_provider, api_key, api_url, rpm, tpm)
         case ProviderAction.DELETE:
             delete_provider(model_provider)
         case ProviderAction.UPDATE:
-            update_provider(model_provider, api_key, api_url)
+            update_provider(model_provider, api_key, api_url, rpm, tpm)
@@ -0,0 +1,70 @@
+import typer
+
+
+def stats_command(
+    run_id: int = typer.Argument(..., help="Id of the run to report on"),
+) -> None:
+    """Print the throughput and LLM call latencies of each step of a run."""
+    from rich.console import Console
+    from rich.table import Table
+    from sqlmodel import Session
+
+    from synda.database import get_engine, init_db
+    from synda.model.run import Run
+    from synda.model.step_metrics import StepMetrics
+
+    init_db()
+    with Session(get_engine()) as session:
+        if session.get(Run, run_id) is None:
+            typer.secho(f"Run {run_id} not found", fg=typer.colors.RED)
+            raise typer.Exit(1)
+
+        rows = StepMetrics.get_for_run(session, run_id)
+
+    if not rows:
+        typer.secho(f"No metrics recorded for run {run_id}", fg=typer.colors.YELLOW)
+        raise typer.Exit(1)
+
+    table = Table(title=f"Run {run_id}")
+    for column in [
+        "Step",
+        "Duration (s)",
+        "Nodes in/out",
+        "Nodes/s",
+        "LLM calls",
+        "Tokens",
+        "Tokens/s",
+        "Cache hits",
+        "Retries",
+        "p50/p95/p99 (ms)",
+    ]:
+        table.add_column(column, justify="left" if column == "Step" else "right")
+
+    for step, metrics in rows:
+        table.add_row(
+            f"{step.position}. {step.name}",
+            f"{metrics.duration:.2f}",
+            f"{metrics.input_nodes}/{metrics.output_nodes}",
+            _rate(metrics.input_nodes, metrics.duration),
+            str(metrics.llm_calls),
+            str(metrics.total_tokens),
+            _rate(metrics.total_tokens, metrics.duration),
+            f"{metrics.cache_hits}/{metrics.cache_hits + metrics.cache_misses}",
+            str(metrics.retries),
+            _latencies(metrics),
+        )
+
+    Console().print(table)
+
+
+def _rate(count: int, duration: float) -> str:
+    return f"{count / duration:.1f}" if duration > 0 else "-"
+
+
+def _latencies(metrics) -> str:
+    if metrics.latency_p50 is None:
+        return "-"
+    return "/".join(
+        f"{latency * 1000:.0f}"
+        for latency in (metrics.latency_p50, metrics.latency_p95, metrics.latency_p99)
+    )
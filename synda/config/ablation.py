@@ -6,6 +6,7 @@ from sqlmodel import Session
 from synda.config.step import Step
 from synda.model.run import Run
 from synda.model.step import Step as StepModel
+from synda.utils.response_cache import CacheMode
 
 
 class AblationParameters(BaseModel):
@@ -16,6 +17,10 @@ class AblationParameters(BaseModel):
     criteria: list[str]
     batch: bool = False
     batch_size: int | None = 40
+    concurrency: int | None = None
+    rpm: int | None = None
+    tpm: int | None = None
+    cache: CacheMode = CacheMode.OFF
 
 class Ablation(Step):
     type: str = "ablation"
@@ -7,6 +7,7 @@ from synda.config.step import Step
 from synda.model.run import Run
 from synda.model.step import Step as StepModel
 from synda.pipeline.executor import Executor
+from synda.utils.text import Normalization
 
 
 class DeduplicateParametersTFIDF(BaseModel):
@@ -19,11 +20,43 @@ class DeduplicateParametersTFIDF(BaseModel):
     keep: Literal["first", "last"] = Field(
         default="first", description="Keep the first or last duplicate"
     )
+    block_size: int = Field(
+        default=1024, gt=0, description="Rows compared per sparse similarity block (fuzzy)"
+    )
+    normalize: list[Normalization] = Field(
+        default_factory=list, description="Normalizations applied before comparing values (exact)"
+    )
+    cross_run: bool = Field(
+        default=False, description="Also drop the values kept by earlier runs sharing the same index (exact)"
+    )
+    index_name: str = Field(
+        default="default", description="Name of the persistent hash index used by cross_run"
+    )
 
 class DeduplicateParametersEmbed(BaseModel):
     provider: str = Field(description="Provider name (e.g. mistral, openai)")
     model: str = Field(description="Embedding model name")
     similarity_threshold: float = Field(default=0.7, description="Threshold for similarity (distance)")
+    rpm: int | None = Field(default=None, description="Requests per minute, overrides the provider limit")
+    tpm: int | None = Field(default=None, description="Tokens per minute, overrides the provider limit")
+    cache: bool = Field(default=True, description="Only embed texts missing from the local embedding cache")
+    batch_size: int = Field(default=256, gt=0, description="Maximum texts per embedding request")
+    max_batch_tokens: int = Field(default=100_000, gt=0, description="Maximum estimated tokens per embedding request")
+    concurrency: int | None = Field(default=None, gt=0, description="Embedding requests in flight, defaults to execution.concurrency or 4")
+    max_retries: int = Field(default=3, ge=0, description="Retries of a failed embedding request")
+    max_memory_mb: int = Field(default=256, gt=0, description="Memory budget of a similarity tile")
+
+
+class DeduplicateParametersMinHash(BaseModel):
+    similarity_threshold: float = Field(default=0.8, ge=0, le=1, description="Estimated Jaccard similarity above which texts are duplicates")
+    shingle: Literal["word", "char"] = Field(default="word", description="Split texts into word or character shingles")
+    shingle_size: int = Field(default=3, gt=0, description="Words or characters per shingle")
+    bands: int = Field(default=32, gt=0, description="LSH bands, more bands find less similar candidates")
+    rows: int = Field(default=4, gt=0, description="MinHash values per band, the signature holds bands * rows values")
+    seed: int = Field(default=1, description="Seed of the MinHash permutations")
+    keep: Literal["first", "last"] = Field(
+        default="first", description="Keep the first or last duplicate"
+    )
 
 
 class DeduplicateTFIDF(Step):
@@ -51,6 +84,22 @@ class DeduplicateEmbed(Step):
 
         return DeduplicateEmbed(session, run, step_model)
 
-Clean = Annotated[DeduplicateTFIDF | DeduplicateEmbed, Field(discriminator="method")]
+
+class DeduplicateMinHash(Step):
+    type: str = "clean"
+    method: Literal["deduplicate-minhash"]
+    parameters: DeduplicateParametersMinHash
+
+    def get_executor(
+        self, session: Session, run: Run, step_model: StepModel
+    ) -> Executor:
+        from synda.pipeline.clean import DeduplicateMinHash
+
+        return DeduplicateMinHash(session, run, step_model)
+
+Clean = Annotated[
+    DeduplicateTFIDF | DeduplicateEmbed | DeduplicateMinHash,
+    Field(discriminator="method"),
+]
 
 deduplicate_adapter = TypeAdapter(Clean)
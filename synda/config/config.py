@@ -1,17 +1,18 @@
 from pathlib import Path
 
 import yaml
-from pydantic import BaseModel, ValidationError, model_validator
+from pydantic import BaseModel, Field, ValidationError, model_validator
 from sqlmodel import Session, select
 
 from synda.config.ablation import Ablation
 from synda.config.clean import Clean
+from synda.config.execution import ExecutionConfig
 from synda.config.generation import Generation
 from synda.config.input import InputConfig
 from synda.config.metadata import Metadata
 from synda.config.output import OutputConfig
 from synda.config.split import Split
-from synda.database import engine
+from synda.database import get_engine
 from synda.model.provider import Provider
 
 
@@ -23,6 +24,7 @@ class Config(BaseModel):
     input: InputConfig
     pipeline: list[Split | Generation | Ablation | Clean | Metadata]
     output: OutputConfig
+    execution: ExecutionConfig = Field(default_factory=ExecutionConfig)
 
     @classmethod
     def from_yaml(cls, path: Path) -> "Config":
@@ -42,7 +44,7 @@ class Config(BaseModel):
         if not required_providers:
             return self
 
-        with Session(engine) as session:
+        with Session(get_engine()) as session:
             statement = select(Provider).where(
                 Provider.name.in_(required_providers)  # noqa
             )
@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+
+
+class ExecutionConfig(BaseModel):
+    streaming: bool = Field(
+        default=False,
+        description="Stream nodes between steps in batches instead of whole lists",
+    )
+    batch_size: int = Field(
+        default=100,
+        gt=0,
+        description="Number of nodes flowing between two streamed steps at once",
+    )
+    flush_size: int = Field(
+        default=100,
+        gt=0,
+        description="Number of generated nodes persisted per database commit",
+    )
+    concurrency: int | None = Field(
+        default=None,
+        gt=0,
+        description="LLM requests kept in flight by batched steps, unless set per step",
+    )
+    shard_run: bool | None = Field(
+        default=None,
+        description="Keep the nodes of the run in their own SQLite file, defaults to SYNDA_SHARD_RUNS",
+    )
@@ -6,6 +6,7 @@ from sqlmodel import Session
 from synda.config.step import Step
 from synda.model.run import Run
 from synda.model.step import Step as StepModel
+from synda.utils.response_cache import CacheMode
 
 
 class GenerationParameters(BaseModel):
@@ -18,6 +19,10 @@ class GenerationParameters(BaseModel):
     template: str
     batch: bool = False
     batch_size: int | None = 40
+    concurrency: int | None = None
+    rpm: int | None = None
+    tpm: int | None = None
+    cache: CacheMode = CacheMode.OFF
 
 
 class Generation(Step):
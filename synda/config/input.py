@@ -1,80 +1,262 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+import glob
+import json
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from enum import StrEnum
+from itertools import islice
 from pathlib import Path
+from typing import Literal
 
-import pandas as pd
-import PyPDF2
-from pydantic import BaseModel, Field, FilePath
+from pydantic import BaseModel, Field, model_validator
 from sqlmodel import Session
 
 from synda.model.node import Node
+from synda.utils.dependencies import import_optional
+from synda.utils.extraction_cache import get_extraction_cache
+from synda.utils.iterables import batched
 
 
 class InputFormat(StrEnum):
     CSV = "csv"
     XLS = "xls"
     PDF = "pdf"
+    JSONL = "jsonl"
+    PARQUET = "parquet"
+
+
+# Files picked up when the input path is a directory
+FILE_EXTENSIONS = {
+    InputFormat.CSV: {".csv", ".tsv"},
+    InputFormat.XLS: {".xls", ".xlsx"},
+    InputFormat.PDF: {".pdf"},
+    InputFormat.JSONL: {".jsonl", ".ndjson"},
+    InputFormat.PARQUET: {".parquet"},
+}
+
+INCREMENTAL_FORMATS = {InputFormat.CSV, InputFormat.JSONL, InputFormat.PARQUET}
+
+# Pages of a PDF extracted by a single worker task
+PDF_PAGES_PER_TASK = 16
 
 
 class InputConfig(BaseModel):
     format: InputFormat
-    path: FilePath
+    path: Path
     target_column: str | None = None
     separator: str = ";"
     sheet_name: str = "Sheet1"
     pages: list[str] = Field(default_factory=list)
 
-    def load_csv(self, session: Session) -> list[Node]:
-        df = pd.read_csv(self.path, sep=self.separator)
-        _check_column(path=self.path, columns=df.columns, target=self.target_column)
-
-        nodes = [Node(value=value) for value in df[self.target_column].values]
-        return _persist_nodes(session, nodes)
-
-    def load_xls(self, session: Session) -> list[Node]:
-        df = pd.read_excel(self.path, sheet_name=self.sheet_name)
-        _check_column(path=self.path, columns=df.columns, target=self.target_column)
-
-        nodes = [Node(value=value) for value in df[self.target_column].values]
-        return _persist_nodes(session, nodes)
-
-    def load_pdf(self, session: Session) -> list[Node]:
-        with self.path.open("rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            total_pages = len(reader.pages)
-            indices = _get_page_indices(self.pages, total_pages)
-
-            nodes = []
-            for idx in indices:
-                page = reader.pages[idx]
-                text = page.extract_text()
-
-                nodes.append(
-                    Node(
-                        value=text,
-                        node_metadata=[
-                            {
-                                "source_type": "pdf",
-                                "source_path": str(self.path),
-                                "page_number": idx + 1,
-                                "total_pages": total_pages,
-                            }
-                        ],
-                    )
-                )
-
-        return _persist_nodes(session, nodes)
+    # csv, jsonl and parquet
+    chunksize: int = Field(default=10_000, gt=0)
 
-    def load_nodes(self, session: Session) -> list[Node]:
+    # csv-only
+    engine: Literal["c", "pyarrow"] = "c"
+
+    # directories, glob patterns and pdf
+    workers: int | None = Field(default=None, gt=0)
+    cache: bool = True
+
+    @model_validator(mode="after")
+    def check_files(self) -> InputConfig:
+        if not self.list_files():
+            raise ValueError(f"No {self.format} file found at {self.path}")
+        return self
+
+    def list_files(self) -> list[Path]:
+        """
+        The input file, the files matching a glob pattern, or the files of a
+        directory (recursively) with the extension of the input format
+        """
+        if any(char in str(self.path) for char in "*?["):
+            return sorted(
+                Path(match)
+                for match in glob.glob(str(self.path), recursive=True)
+                if Path(match).is_file()
+            )
+
+        if self.path.is_dir():
+            return sorted(
+                path
+                for path in self.path.rglob("*")
+                if path.is_file()
+                and path.suffix.lower() in FILE_EXTENSIONS[self.format]
+            )
+
+        return [self.path] if self.path.is_file() else []
+
+    def read_chunks(self, path: Path) -> Iterator[list]:
+        """
+        Target column of a tabular file, `chunksize` rows at a time when the
+        format can be read incrementally
+        """
         match self.format:
             case InputFormat.CSV:
-                return self.load_csv(session)
+                return self._read_csv(path)
+            case InputFormat.JSONL:
+                return _read_jsonl_column(path, self.target_column, self.chunksize)
+            case InputFormat.PARQUET:
+                return self._read_parquet(path)
             case InputFormat.XLS:
-                return self.load_xls(session)
-            case InputFormat.PDF:
-                return self.load_pdf(session)
+                return self._read_xls(path)
+        raise ValueError(f"Can't read {self.format} files by chunks")
+
+    def _read_csv(self, path: Path) -> Iterator[list]:
+        import pandas as pd
+
+        columns = pd.read_csv(path, sep=self.separator, nrows=0).columns
+        _check_column(path=path, columns=columns, target=self.target_column)
+
+        if self.engine == "pyarrow":
+            return _read_csv_column_with_pyarrow(
+                path, self.separator, self.target_column, self.chunksize
+            )
+
+        return (
+            chunk[self.target_column].tolist()
+            for chunk in pd.read_csv(
+                path,
+                sep=self.separator,
+                usecols=[self.target_column],
+                chunksize=self.chunksize,
+            )
+        )
+
+    def _read_parquet(self, path: Path) -> Iterator[list]:
+        parquet = import_optional("pyarrow.parquet", "parquet", "Parquet input")
+        parquet_file = parquet.ParquetFile(path)
+        _check_column(
+            path=path,
+            columns=parquet_file.schema_arrow.names,
+            target=self.target_column,
+        )
+
+        return (
+            record_batch.column(0).to_pylist()
+            for record_batch in parquet_file.iter_batches(
+                batch_size=self.chunksize, columns=[self.target_column]
+            )
+        )
+
+    def _read_xls(self, path: Path) -> Iterator[list]:
+        import pandas as pd
+
+        df = pd.read_excel(path, sheet_name=self.sheet_name)
+        _check_column(path=path, columns=df.columns, target=self.target_column)
+        yield df[self.target_column].tolist()
+
+    def load_nodes(self, session: Session) -> list[Node]:
+        return [node for nodes in self.stream_nodes(session) for node in nodes]
+
+    def stream_nodes(self, session: Session, skip: int = 0) -> Iterator[list[Node]]:
+        """
+        Persisted input nodes in batches, leaving out the first `skip` values.
+        A single CSV, JSONL or Parquet file is read incrementally, other
+        inputs are extracted in a process pool.
+        """
+        files = self.list_files()
+
+        if len(files) == 1 and self.format in INCREMENTAL_FORMATS:
+            chunks = _skip_values(self.read_chunks(files[0]), skip)
+            yield from _persist_chunks(session, chunks)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            records = islice(self._extract_records(files, pool), skip, None)
+            for records_chunk in batched(records, self.chunksize):
+                nodes = [
+                    Node(value=value, node_metadata=metadata)
+                    for value, metadata in records_chunk
+                ]
+                yield _persist_nodes(session, nodes)
+
+    def _extract_records(
+        self, files: list[Path], pool: Executor
+    ) -> Iterator[tuple[str, list[dict]]]:
+        """
+        (value, metadata) of every file in order. Files absent from the
+        extraction cache are all submitted before the first one is awaited.
+        """
+        cache = get_extraction_cache() if self.cache else None
+        key = self._extraction_key()
+
+        extractions = []
+        for path in files:
+            file_hash = cache.file_hash(path) if cache is not None else None
+            extracted = cache.get(file_hash, key) if cache is not None else None
+            futures = self._submit(pool, path) if extracted is None else []
+            extractions.append((path, file_hash, extracted, futures))
+
+        for path, file_hash, extracted, futures in extractions:
+            if extracted is None:
+                extracted = self._collect(futures)
+                if cache is not None:
+                    cache.set(file_hash, key, extracted)
+
+            yield from self._to_records(path, extracted)
+
+    def _extraction_key(self) -> str:
+        if self.format == InputFormat.PDF:
+            options = {"pages": self.pages}
+        else:
+            options = {
+                "target_column": self.target_column,
+                "separator": self.separator,
+                "sheet_name": self.sheet_name,
+            }
+        return json.dumps({"format": self.format, **options}, sort_keys=True)
+
+    def _submit(self, pool: Executor, path: Path) -> list[Future]:
+        if self.format != InputFormat.PDF:
+            return [pool.submit(_read_values, self, path)]
+
+        import PyPDF2
+
+        with path.open("rb") as f:
+            total_pages = len(PyPDF2.PdfReader(f).pages)
+
+        # Large documents are split into page ranges parsed concurrently
+        indices = _get_page_indices(self.pages, total_pages)
+        return [
+            pool.submit(_extract_pdf_pages, path, page_range)
+            for page_range in batched(indices, PDF_PAGES_PER_TASK)
+        ]
+
+    def _collect(self, futures: list[Future]) -> dict:
+        results = [future.result() for future in futures]
+
+        if self.format != InputFormat.PDF:
+            return {"values": results[0]}
+
+        return {
+            "total_pages": results[0][0] if results else 0,
+            "texts": [text for _, texts in results for text in texts],
+        }
+
+    def _to_records(
+        self, path: Path, extracted: dict
+    ) -> Iterator[tuple[str, list[dict]]]:
+        if self.format != InputFormat.PDF:
+            return ((value, []) for value in extracted["values"])
+
+        total_pages = extracted["total_pages"]
+        indices = _get_page_indices(self.pages, total_pages)
+        return (
+            (
+                text,
+                [
+                    {
+                        "source_type": "pdf",
+                        "source_path": str(path),
+                        "page_number": idx + 1,
+                        "total_pages": total_pages,
+                    }
+                ],
+            )
+            for idx, text in zip(indices, extracted["texts"])
+        )
 
 
 def _check_column(path: Path, columns: Iterable[str], target: str | None) -> None:
@@ -100,17 +282,76 @@ def _get_page_indices(pages: list[str], total: int) -> list[int]:
     return [i for i in sorted(indices) if 0 <= i < total]
 
 
+def _read_csv_column_with_pyarrow(
+    path: Path, separator: str, column: str, chunksize: int
+) -> Iterator[list]:
+    csv = import_optional("pyarrow.csv", "parquet", "The 'pyarrow' CSV engine")
+    reader = csv.open_csv(
+        path,
+        parse_options=csv.ParseOptions(delimiter=separator),
+        convert_options=csv.ConvertOptions(include_columns=[column]),
+    )
+
+    values = []
+    for record_batch in reader:
+        values.extend(record_batch.column(0).to_pylist())
+        while len(values) >= chunksize:
+            yield values[:chunksize]
+            values = values[chunksize:]
+
+    if values:
+        yield values
+
+
+def _read_jsonl_column(path: Path, column: str, chunksize: int) -> Iterator[list]:
+    with path.open(encoding="utf-8") as f:
+        records = (json.loads(line) for line in f if line.strip())
+
+        for records_chunk in batched(records, chunksize):
+            values = []
+            for record in records_chunk:
+                if column not in record:
+                    _check_column(path=path, columns=record.keys(), target=column)
+                values.append(record[column])
+            yield values
+
+
+def _read_values(config: InputConfig, path: Path) -> list:
+    return [value for values in config.read_chunks(path) for value in values]
+
+
+def _extract_pdf_pages(path: Path, indices: list[int]) -> tuple[int, list[str]]:
+    import PyPDF2
+
+    with path.open("rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        return len(reader.pages), [reader.pages[idx].extract_text() for idx in indices]
+
+
+def _skip_values(chunks: Iterable[Iterable], skip: int) -> Iterator[list]:
+    for values in chunks:
+        values = list(values)
+        if skip >= len(values):
+            skip -= len(values)
+            continue
+
+        yield values[skip:]
+        skip = 0
+
+
+def _persist_chunks(
+    session: Session, chunks: Iterable[Iterable]
+) -> Iterator[list[Node]]:
+    for values in chunks:
+        yield _persist_nodes(session, [Node(value=value) for value in values])
+
+
 def _persist_nodes(session: Session, nodes: list[Node]) -> list[Node]:
-    for node in nodes:
-        session.add(node)
+    session.add_all(nodes)
     session.flush()
 
     for node in nodes:
         node.ancestors = {"source": node.id}
-        session.add(node)
     session.commit()
 
-    for node in nodes:
-        session.refresh(node)
-
     return nodes
@@ -13,6 +13,9 @@ class WordPositionParameters(BaseModel):
     matches: dict[str, str] = Field(
         description="A dictionary with 'key' = LABEl and 'value' = string to match"
     )
+    occurrences: Literal["first", "all"] = Field(
+        default="first", description="Record the first or every occurrence of a match"
+    )
 
 
 class WordPosition(Step):
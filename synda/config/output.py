@@ -3,15 +3,23 @@ from __future__ import annotations
 from enum import StrEnum, auto
 from pathlib import Path
 
-import pandas as pd
 from pydantic import BaseModel, Field, model_validator
 
 from synda.model.node import Node
+from synda.utils.output_writer import (
+    CSVOutputWriter,
+    JSONLOutputWriter,
+    OutputWriter,
+    ParquetOutputWriter,
+    XLSOutputWriter,
+)
 
 
 class OutputFormat(StrEnum):
     CSV = auto()
     XLS = auto()
+    JSONL = auto()
+    PARQUET = auto()
 
 
 class OutputConfig(BaseModel):
@@ -19,13 +27,17 @@ class OutputConfig(BaseModel):
     path: Path
     overwrite: bool = False
 
+    columns: list[str] = Field(default_factory=lambda: ["value"])
+
     # csv-only
     separator: str = ";"
-    columns: list[str] = Field(default_factory=lambda: ["value"])
 
     # xls-only
     sheet_name: str = "Sheet1"
 
+    # parquet-only
+    row_group_size: int = Field(default=10_000, gt=0)
+
     @model_validator(mode="after")
     def validate_path(self) -> OutputConfig:
         resolved_path = self.path.resolve()
@@ -39,27 +51,33 @@ class OutputConfig(BaseModel):
         self.path = resolved_path
         return self
 
+    def open_writer(self) -> OutputWriter:
+        match self.format:
+            case OutputFormat.CSV:
+                return CSVOutputWriter(self)
+            case OutputFormat.XLS:
+                return XLSOutputWriter(self)
+            case OutputFormat.JSONL:
+                return JSONLOutputWriter(self)
+            case OutputFormat.PARQUET:
+                return ParquetOutputWriter(self)
+
     def save_output(self, nodes: list[Node]) -> None:
-        values = [node.value for node in nodes]
-        ablated = [node.is_ablated_text() for node in nodes]
-        metadata = [node.node_metadata for node in nodes]
+        with self.open_writer() as writer:
+            writer.write(nodes)
+            writer.commit()
 
+    def select_columns(self, nodes: list[Node], typed: bool) -> dict[str, list]:
         available_columns = {
-            "value": values,
-            "ablated": ablated,
-            "metadata": metadata,
+            "value": lambda: [node.value for node in nodes],
+            "ablated": lambda: [
+                node.ablated if typed else node.is_ablated_text() for node in nodes
+            ],
+            "metadata": lambda: [node.node_metadata for node in nodes],
         }
 
-        selected = {
-            col: available_columns[col]
+        return {
+            col: available_columns[col]()
             for col in self.columns
             if col in available_columns
         }
-
-        df = pd.DataFrame(selected)
-
-        match self.format:
-            case OutputFormat.CSV:
-                df.to_csv(self.path, sep=self.separator, index=False)
-            case OutputFormat.XLS:
-                df.to_excel(self.path, sheet_name=self.sheet_name, index=False)
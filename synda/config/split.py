@@ -1,6 +1,6 @@
 from typing import Annotated, Literal, Union
 
-from pydantic import BaseModel, Field, TypeAdapter
+from pydantic import BaseModel, Field, TypeAdapter, model_validator
 from sqlmodel import Session
 
 from synda.config.step import Step
@@ -11,9 +11,24 @@ from synda.pipeline.executor import Executor
 
 class ChunkParameters(BaseModel):
     size: int = Field(
-        default=500, gt=0, lt=10000, description="Size of each chunk in characters"
+        default=500, gt=0, lt=10000, description="Size of each chunk, in `unit`"
+    )
+    overlap: int = Field(
+        default=0, ge=0, description="Characters or tokens shared by consecutive chunks"
+    )
+    unit: Literal["characters", "tokens"] = Field(
+        default="characters", description="Measure chunks in characters or tokens"
+    )
+    encoding: str = Field(
+        default="cl100k_base", description="Tiktoken encoding counting the tokens"
     )
 
+    @model_validator(mode="after")
+    def validate_overlap(self) -> "ChunkParameters":
+        if self.overlap >= self.size:
+            raise ValueError("overlap must be smaller than size")
+        return self
+
 
 class ChunkSplit(Step):
     type: Literal["split"]
@@ -28,11 +43,28 @@ class ChunkSplit(Step):
         return Chunk(session, run, step_model)
 
 
+DEFAULT_ABBREVIATIONS = [
+    "Mr", "Mrs", "Ms", "Dr", "Prof", "Sr", "Jr", "St", "vs", "etc", "e.g", "i.e",
+    "cf", "approx", "Inc", "Ltd", "Co", "Corp", "No", "Fig", "Vol", "p", "pp",
+    "M", "Mme", "Mlle",
+]
+
+
 class SeparatorParameters(BaseModel):
-    separator: str = Field(default=".", description="The separator character(s)")
+    separator: str | list[str] = Field(
+        default=".", description="The separator(s), literal strings or regexes"
+    )
+    mode: Literal["literal", "regex", "sentence"] = Field(
+        default="literal",
+        description="Split on literal separators, regexes or sentence boundaries",
+    )
     keep_separator: bool = Field(
         default=True, description="Should keep the separator character(s)"
     )
+    abbreviations: list[str] = Field(
+        default_factory=lambda: list(DEFAULT_ABBREVIATIONS),
+        description="Words whose trailing period never ends a sentence (sentence mode)",
+    )
 
 
 class SeparatorSplit(Step):
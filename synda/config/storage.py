@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class StorageConfig(BaseModel):
+    path: Path = Field(
+        default_factory=lambda: Path.home() / ".synda" / "synda.db",
+        description="SQLite catalog holding providers, runs, steps and nodes",
+    )
+    journal_mode: Literal["wal", "delete", "truncate"] = "wal"
+    synchronous: Literal["off", "normal", "full"] = Field(
+        default="normal",
+        description="'normal' is durable in WAL mode, a crash may only lose the last commits",
+    )
+    cache_size_mb: int = Field(default=64, ge=0)
+    mmap_size_mb: int = Field(default=256, ge=0)
+    temp_store: Literal["default", "file", "memory"] = "memory"
+    shard_runs: bool = Field(
+        default=False,
+        description="Keep the nodes of each run in their own file attached to the catalog",
+    )
+
+    @classmethod
+    def from_env(cls) -> StorageConfig:
+        """
+        Defaults overridden by the SYNDA_DATABASE_PATH, SYNDA_SQLITE_SYNCHRONOUS
+        and SYNDA_SHARD_RUNS environment variables
+        """
+        overrides = {
+            "path": os.getenv("SYNDA_DATABASE_PATH"),
+            "synchronous": os.getenv("SYNDA_SQLITE_SYNCHRONOUS"),
+            "shard_runs": os.getenv("SYNDA_SHARD_RUNS"),
+        }
+        return cls.model_validate(
+            {name: value for name, value in overrides.items() if value}
+        )
+
+    @property
+    def runs_dir(self) -> Path:
+        return self.path.parent / "runs"
+
+    def run_path(self, run_id: int) -> Path:
+        return self.runs_dir / f"run_{run_id}.db"
+
+    def pragmas(self, schema: str = "main") -> list[str]:
+        """
+        Statements tuning the `schema` database of a new connection
+        """
+        return [
+            f"PRAGMA {schema}.journal_mode = {self.journal_mode}",
+            f"PRAGMA {schema}.synchronous = {self.synchronous}",
+            # Negative sizes are in KiB rather than in pages
+            f"PRAGMA {schema}.cache_size = {-self.cache_size_mb * 1024}",
+            f"PRAGMA {schema}.mmap_size = {self.mmap_size_mb * 1024 * 1024}",
+            f"PRAGMA temp_store = {self.temp_store}",
+        ]
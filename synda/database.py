@@ -1,20 +1,129 @@
+from __future__ import annotations
+
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Engine, event
+from sqlmodel import Session, create_engine
+
+if TYPE_CHECKING:
+    from synda.config.storage import StorageConfig
+
+# Name of the catalog database attached to the per-run databases
+CATALOG_SCHEMA = "catalog"
+
+_storage: StorageConfig | None = None
+_engine: Engine | None = None
+_run_engines: dict[int, Engine] = {}
+
+
+def get_synda_dir() -> Path:
+    """
+    Directory of the local caches, created on first use
+    """
+    synda_dir = Path.home() / ".synda"
+    synda_dir.mkdir(exist_ok=True)
+    return synda_dir
+
+
+def get_storage() -> StorageConfig:
+    global _storage
+    if _storage is None:
+        from synda.config.storage import StorageConfig
+
+        _storage = StorageConfig.from_env()
+    return _storage
+
+
+def configure_storage(storage: StorageConfig) -> None:
+    """
+    Point every following session to the catalog of `storage`
+    """
+    global _storage, _engine
+    for engine in [_engine, *_run_engines.values()]:
+        if engine is not None:
+            engine.dispose()
 
-from sqlmodel import Session, SQLModel, create_engine
+    _storage, _engine = storage, None
+    _run_engines.clear()
 
-home_dir = Path.home()
-synda_dir = home_dir / ".synda"
-synda_dir.mkdir(exist_ok=True)
 
-DATABASE_URL = f"sqlite:///{synda_dir}/synda.db"
+def get_engine() -> Engine:
+    global _engine
+    if _engine is None:
+        storage = get_storage()
+        storage.path.parent.mkdir(parents=True, exist_ok=True)
+        _engine = _create_sqlite_engine(storage.path, storage)
+    return _engine
 
-engine = create_engine(DATABASE_URL)
+
+def get_run_engine(run_id: int, create: bool = False) -> Engine:
+    """
+    Engine of the database holding the nodes of a run: its own file with the
+    catalog attached when the run is sharded, the catalog otherwise
+    """
+    storage = get_storage()
+    run_path = storage.run_path(run_id)
+
+    if run_id in _run_engines:
+        return _run_engines[run_id]
+    if not create and not run_path.exists():
+        return get_engine()
+
+    run_path.parent.mkdir(parents=True, exist_ok=True)
+    _create_run_tables(run_path, storage)
+    _run_engines[run_id] = _create_sqlite_engine(
+        run_path, storage, attached={CATALOG_SCHEMA: storage.path}
+    )
+    return _run_engines[run_id]
 
 
 def get_session():
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
         yield session
 
 
 def init_db():
-    SQLModel.metadata.create_all(engine)
+    # Register every table, models are only imported when they are used
+    import synda.model.provider  # noqa: F401
+    import synda.model.run  # noqa: F401
+    import synda.model.step_metrics  # noqa: F401
+    import synda.model.value_hash  # noqa: F401
+
+    from synda.migrations import create_tables
+
+    create_tables(get_engine())
+
+
+def _create_sqlite_engine(
+    path: Path, storage: StorageConfig, attached: dict[str, Path] | None = None
+) -> Engine:
+    engine = create_engine(f"sqlite:///{path}")
+
+    @event.listens_for(engine, "connect")
+    def configure_connection(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        for schema, attached_path in (attached or {}).items():
+            cursor.execute("ATTACH DATABASE ? AS ?", (str(attached_path), schema))
+        for schema in ["main", *(attached or {})]:
+            for pragma in storage.pragmas(schema):
+                cursor.execute(pragma)
+        cursor.close()
+
+    return engine
+
+
+def _create_run_tables(run_path: Path, storage: StorageConfig) -> None:
+    """
+    Create the node tables of a per-run database. Unqualified names resolve
+    to the first attached database having the table, so run and step
+    queries fall through to the catalog.
+    """
+    from synda.migrations import create_tables
+    from synda.model.node import Node
+    from synda.model.step_node import StepNode
+
+    # Without the catalog attached, its node tables can't be mistaken for ours
+    engine = _create_sqlite_engine(run_path, storage)
+    create_tables(engine, tables=[Node.__table__, StepNode.__table__])
+    engine.dispose()
@@ -0,0 +1,93 @@
+from collections.abc import Callable
+
+from sqlalchemy import Connection, Engine, Table, inspect
+from sqlmodel import SQLModel
+
+
+def create_tables(engine: Engine, tables: list[Table] | None = None) -> None:
+    """
+    Create the missing tables and bring the database to the latest version.
+    A database without any table is built from the current models, which
+    already include what every migration adds.
+    """
+    is_new = not inspect(engine).get_table_names()
+    SQLModel.metadata.create_all(engine, tables=tables)
+
+    if is_new:
+        with engine.begin() as connection:
+            _set_version(connection, len(MIGRATIONS))
+    else:
+        migrate(engine)
+
+
+def migrate(engine: Engine) -> int:
+    """
+    Apply the migrations a database has not run yet, its version being stored
+    in SQLite's `user_version`. Tables missing from the database (e.g. the
+    catalog tables of a per-run database) are left alone.
+    """
+    with engine.begin() as connection:
+        version = connection.exec_driver_sql("PRAGMA main.user_version").scalar()
+
+        for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            migration(connection)
+            _set_version(connection, number)
+
+    return max(version, len(MIGRATIONS))
+
+
+def _set_version(connection: Connection, version: int) -> None:
+    connection.exec_driver_sql(f"PRAGMA main.user_version = {version}")
+
+
+def _add_provider_rate_limits(connection: Connection) -> None:
+    """
+    Rate limit columns added to the provider table before migrations were
+    versioned. Catalogs created in between already have them.
+    """
+    if not inspect(connection).has_table("provider"):
+        return
+
+    existing_columns = {
+        column["name"] for column in inspect(connection).get_columns("provider")
+    }
+    for column in ("rpm", "tpm"):
+        if column not in existing_columns:
+            connection.exec_driver_sql(
+                f"ALTER TABLE provider ADD COLUMN {column} INTEGER"
+            )
+
+
+def _add_node_graph_indexes(connection: Connection) -> None:
+    """
+    Indexes of the resume and lineage queries, declared on the models for new
+    databases
+    """
+    _create_index(connection, "ix_node_parent_node_id", "node", ["parent_node_id"])
+    _create_index(connection, "ix_node_status", "node", ["status"])
+    _create_index(connection, "ix_step_run_id_position", "step", ["run_id", "position"])
+    _create_index(
+        connection,
+        "ix_step_node_node_id_relationship_type",
+        "step_node",
+        ["node_id", "relationship_type"],
+    )
+
+
+def _create_index(
+    connection: Connection, name: str, table: str, columns: list[str]
+) -> None:
+    if not inspect(connection).has_table(table):
+        return
+
+    connection.exec_driver_sql(
+        f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+    )
+
+
+# Applied in order, a database at version N has run the first N of them.
+# Append new migrations, never edit or reorder the released ones.
+MIGRATIONS: list[Callable[[Connection], None]] = [
+    _add_provider_rate_limits,
+    _add_node_graph_indexes,
+]
@@ -1,9 +1,12 @@
 from enum import Enum
 from typing import TYPE_CHECKING, Union, Any
 from sqlmodel import SQLModel, Field, Relationship, Column, JSON, Session, select
-from sqlalchemy import and_
+from sqlalchemy import and_, update
+from sqlalchemy.orm.attributes import set_committed_value
 
 from synda.model.step_node import StepNode, StepNodeRelationshipType
+from synda.model.utils import MAX_QUERY_PARAMETERS
+from synda.utils.iterables import batched
 
 if TYPE_CHECKING:
     from synda.model.step import Step
@@ -16,11 +19,11 @@ class NodeStatus(Enum):
 
 class Node(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
-    parent_node_id: int | None = None
+    parent_node_id: int | None = Field(default=None, index=True)
     ablated: bool = False
     value: str
     ancestors: dict = Field(default_factory=dict, sa_column=Column(JSON))
-    status: NodeStatus = Field(default=NodeStatus.PENDING)
+    status: NodeStatus = Field(default=NodeStatus.PENDING, index=True)
     node_metadata: list[dict[str, Any]] = Field(
         default_factory=list, sa_column=Column(JSON)
     )
@@ -49,6 +52,13 @@ class Node(SQLModel, table=True):
         },
     )
 
+    def __init__(self, **data: Any):
+        # Much cheaper than pydantic's default factories: it inspects their
+        # signature on every instantiation
+        data.setdefault("ancestors", {})
+        data.setdefault("node_metadata", [])
+        super().__init__(**data)
+
     @classmethod
     def get(
         cls, session: Session, node_ids: Union[int, list[int]]
@@ -66,13 +76,23 @@ class Node(SQLModel, table=True):
 
     @staticmethod
     def get_input_nodes_from_step(session: Session, step: "Step") -> list["Node"]:
+        return Node._get_step_nodes(session, step, StepNodeRelationshipType.INPUT)
+
+    @staticmethod
+    def get_output_nodes_from_step(session: Session, step: "Step") -> list["Node"]:
+        return Node._get_step_nodes(session, step, StepNodeRelationshipType.OUTPUT)
+
+    @staticmethod
+    def _get_step_nodes(
+        session: Session, step: "Step", relationship_type: StepNodeRelationshipType
+    ) -> list["Node"]:
         return session.exec(
             select(Node)
             .join(StepNode, Node.id == StepNode.node_id)
             .where(
                 and_(
                     StepNode.step_id == step.id,
-                    StepNode.relationship_type == StepNodeRelationshipType.INPUT.value,
+                    StepNode.relationship_type == relationship_type.value,
                 )
             )
         ).fetchall()
@@ -80,8 +100,20 @@ class Node(SQLModel, table=True):
     def is_ablated_text(self) -> str:
         return "yes" if self.ablated else "no"
 
-    def set_processed(self, session: Session):
-        self.status = NodeStatus.PROCESSED
-        session.add(self)
-        session.commit()
-        session.refresh(self)
+    @staticmethod
+    def set_processed_many(session: Session, nodes: list["Node"]) -> None:
+        node_ids = list(dict.fromkeys(node.id for node in nodes))
+
+        for ids in batched(node_ids, MAX_QUERY_PARAMETERS):
+            session.execute(
+                update(Node)
+                .where(Node.id.in_(ids))  # noqa
+                .values(status=NodeStatus.PROCESSED)
+                # Evaluating the criteria against the whole identity map on
+                # every batch is quadratic, the nodes are updated below
+                .execution_options(synchronize_session=False)
+            )
+
+        # Sessions may keep node state across commits, mirror the update
+        for node in nodes:
+            set_committed_value(node, "status", NodeStatus.PROCESSED)
@@ -1,7 +1,7 @@
 from sqlmodel import Session, Field, select
 from synda.model.utils import SQLModel
 
-from synda.database import engine
+from synda.database import get_engine
 
 
 class Provider(SQLModel, table=True):
@@ -9,20 +9,28 @@ class Provider(SQLModel, table=True):
     name: str = Field(index=True, unique=True)
     api_key: str | None = Field(default=None, unique=True)
     api_url: str | None = Field(default=None, unique=True)
+    rpm: int | None = Field(default=None)
+    tpm: int | None = Field(default=None)
 
     @staticmethod
     def create(
-        name: str, api_key: str | None = None, api_url: str | None = None
+        name: str,
+        api_key: str | None = None,
+        api_url: str | None = None,
+        rpm: int | None = None,
+        tpm: int | None = None,
     ) -> "Provider":
-        with Session(engine) as session:
-            provider = Provider(name=name, api_key=api_key, api_url=api_url)
+        with Session(get_engine()) as session:
+            provider = Provider(
+                name=name, api_key=api_key, api_url=api_url, rpm=rpm, tpm=tpm
+            )
             session.add(provider)
             session.commit()
             session.refresh(provider)
             return provider
 
     def update(self, **kwargs) -> "Provider":
-        with Session(engine) as session:
+        with Session(get_engine()) as session:
             for field, value in kwargs.items():
                 setattr(self, field, value)
 
@@ -32,11 +40,11 @@ class Provider(SQLModel, table=True):
             return self
 
     def delete(self) -> None:
-        with Session(engine) as session:
+        with Session(get_engine()) as session:
             session.delete(self)
             session.commit()
 
     @staticmethod
     def get(name: str) -> "Provider":
-        with Session(engine) as session:
+        with Session(get_engine()) as session:
             return session.exec(select(Provider).where(Provider.name == name)).one()
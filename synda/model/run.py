@@ -11,6 +11,7 @@ from synda.model.utils import SQLModel
 
 if TYPE_CHECKING:
     from synda.config import Config
+    from synda.config.execution import ExecutionConfig
 
 
 class RunStatus(str, Enum):
@@ -78,5 +79,10 @@ class Run(SQLModel, table=True):
         session.refresh(self)
         return self
 
+    def get_execution_config(self) -> "ExecutionConfig":
+        from synda.config.execution import ExecutionConfig
+
+        return ExecutionConfig.model_validate((self.config or {}).get("execution", {}))
+
     def get_config(self) -> "Config":
         return Config.model_validate(self.config)
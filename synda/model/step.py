@@ -3,11 +3,12 @@ from enum import Enum
 from typing import TYPE_CHECKING
 
 from sqlmodel import Column, Field, Relationship, JSON, Session, select
-from sqlalchemy import and_
+from sqlalchemy import Index, and_, delete, insert
 
 from synda.model.step_node import StepNode, StepNodeRelationshipType
-from synda.model.node import Node
-from synda.model.utils import SQLModel
+from synda.model.node import Node, NodeStatus
+from synda.model.utils import MAX_QUERY_PARAMETERS, SQLModel
+from synda.utils.iterables import batched
 
 if TYPE_CHECKING:
     from synda.config.step import Step as StepConfig
@@ -22,6 +23,8 @@ class StepStatus(Enum):
 
 
 class Step(SQLModel, table=True):
+    __table_args__ = (Index("ix_step_run_id_position", "run_id", "position"),)
+
     id: int | None = Field(default=None, primary_key=True)
     run_id: int = Field(foreign_key="run.id")
     position: int = Field()
@@ -110,11 +113,41 @@ class Step(SQLModel, table=True):
 
         return self
 
-    def save_during_execution(
-        self, session: Session, input_node: Node, output_node: Node
+    def add_input_nodes(self, session: Session, input_nodes: list[Node]) -> "Step":
+        self._create_and_map_input_nodes_to_step(session, input_nodes)
+        session.commit()
+
+        return self
+
+    def unmap_pending_input_nodes(self, session: Session) -> list[Node]:
+        """
+        Forget the inputs an interrupted step never processed, so that they
+        are mapped again when it reads them on restart
+        """
+        pending_nodes = [
+            node
+            for node in Node.get_input_nodes_from_step(session, self)
+            if node.status == NodeStatus.PENDING
+        ]
+
+        for nodes in batched(pending_nodes, MAX_QUERY_PARAMETERS):
+            session.execute(
+                delete(StepNode).where(
+                    StepNode.step_id == self.id,
+                    StepNode.relationship_type == StepNodeRelationshipType.INPUT.value,
+                    StepNode.node_id.in_([node.id for node in nodes]),  # noqa
+                )
+            )
+        session.commit()
+
+        return pending_nodes
+
+    def save_batch(
+        self, session: Session, input_nodes: list[Node], output_nodes: list[Node]
     ) -> "Step":
-        self._create_nodes_with_ancestors(session, [input_node], [output_node])
-        self._map_output_nodes_to_step(session, [output_node])
+        self._create_nodes_with_ancestors(session, input_nodes, output_nodes)
+        self._map_output_nodes_to_step(session, output_nodes)
+        session.commit()
 
         return self
 
@@ -129,46 +162,52 @@ class Step(SQLModel, table=True):
     def _create_nodes_with_ancestors(
         self, session: Session, input_nodes: list[Node], output_nodes: list[Node]
     ):
-        for node in output_nodes:
-            if node.id is None:
-                session.add(node)
+        session.add_all([node for node in output_nodes if node.id is None])
         session.flush()
+
+        parent_nodes = {node.id: node for node in input_nodes}
         for node in output_nodes:
             parent_id = node.parent_node_id
 
             if parent_id is None:
                 continue
 
-            parent_node = next(node for node in input_nodes if node.id == parent_id)
-            node.ancestors = parent_node.ancestors | {self.name: node.id}
-            session.add(node)
+            node.ancestors = parent_nodes[parent_id].ancestors | {self.name: node.id}
 
-        for node in input_nodes:
-            node.set_processed(session)
+        Node.set_processed_many(session, input_nodes)
 
     def _create_and_map_input_nodes_to_step(
         self, session: Session, input_nodes: list[Node]
     ):
-        for node in input_nodes:
-            session.add(node)
+        session.add_all(input_nodes)
         session.flush()
 
-        for node in input_nodes:
-            step_node = StepNode(
-                step_id=self.id,
-                node_id=node.id,
-                relationship_type=StepNodeRelationshipType.INPUT.value,
-            )
-            session.add(step_node)
+        self._insert_step_nodes(
+            session, input_nodes, StepNodeRelationshipType.INPUT.value
+        )
 
     def _map_output_nodes_to_step(self, session: Session, output_nodes: list[Node]):
-        for node in output_nodes:
-            step_node = StepNode(
-                step_id=self.id,
-                node_id=node.id,
-                relationship_type=StepNodeRelationshipType.OUTPUT.value,
-            )
-            session.add(step_node)
+        self._insert_step_nodes(
+            session, output_nodes, StepNodeRelationshipType.OUTPUT.value
+        )
+
+    def _insert_step_nodes(
+        self, session: Session, nodes: list[Node], relationship_type: str
+    ):
+        if not nodes:
+            return
+
+        session.execute(
+            insert(StepNode),
+            [
+                {
+                    "step_id": self.id,
+                    "node_id": node.id,
+                    "relationship_type": relationship_type,
+                }
+                for node in nodes
+            ],
+        )
 
     def get_step_config(self) -> "StepConfig":
         match self.type:
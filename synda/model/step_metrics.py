@@ -0,0 +1,69 @@
+from datetime import datetime
+
+from sqlmodel import Field, Session, select
+
+from synda.model.step import Step
+from synda.model.utils import SQLModel
+from synda.utils.metrics import MetricsCollector
+
+
+class StepMetrics(SQLModel, table=True):
+    """
+    Performance of one execution of a step, a resumed step gets one per attempt
+    """
+
+    id: int | None = Field(default=None, primary_key=True)
+    run_id: int = Field(foreign_key="run.id", index=True)
+    step_id: int = Field(foreign_key="step.id", index=True)
+    created_at: datetime = Field(default_factory=datetime.now)
+    duration: float = 0.0
+    input_nodes: int = 0
+    output_nodes: int = 0
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    retries: int = 0
+    latency_p50: float | None = None
+    latency_p95: float | None = None
+    latency_p99: float | None = None
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @staticmethod
+    def create(
+        session: Session, step: Step, collector: MetricsCollector
+    ) -> "StepMetrics":
+        latencies = collector.latency_percentiles() or (None, None, None)
+        metrics = StepMetrics(
+            run_id=step.run_id,
+            step_id=step.id,
+            duration=collector.duration,
+            input_nodes=collector.input_nodes,
+            output_nodes=collector.output_nodes,
+            llm_calls=collector.llm_calls,
+            prompt_tokens=collector.prompt_tokens,
+            completion_tokens=collector.completion_tokens,
+            cache_hits=collector.cache_hits,
+            cache_misses=collector.cache_misses,
+            retries=collector.retries,
+            latency_p50=latencies[0],
+            latency_p95=latencies[1],
+            latency_p99=latencies[2],
+        )
+
+        session.add(metrics)
+        session.commit()
+        return metrics
+
+    @staticmethod
+    def get_for_run(session: Session, run_id: int) -> list[tuple[Step, "StepMetrics"]]:
+        return session.exec(
+            select(Step, StepMetrics)
+            .join(StepMetrics, StepMetrics.step_id == Step.id)
+            .where(StepMetrics.run_id == run_id)
+            .order_by(Step.position, StepMetrics.id)  # noqa
+        ).all()
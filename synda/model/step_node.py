@@ -1,6 +1,7 @@
 from enum import Enum
 from typing import TYPE_CHECKING, ClassVar
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship
 from synda.model.utils import SQLModel
 
@@ -16,6 +17,10 @@ class StepNodeRelationshipType(Enum):
 
 class StepNode(SQLModel, table=True):
     __tablename__: ClassVar[str] = "step_node"  # pyright: ignore[reportIncompatibleVariableOverride]
+    # Lineage lookups start from the node, the primary key from the step
+    __table_args__ = (
+        Index("ix_step_node_node_id_relationship_type", "node_id", "relationship_type"),
+    )
     step_id: int = Field(foreign_key="step.id", primary_key=True)
     node_id: int = Field(foreign_key="node.id", primary_key=True)
     relationship_type: StepNodeRelationshipType = Field(index=True)
@@ -3,6 +3,9 @@ import re
 from sqlalchemy.ext.declarative import declared_attr
 from sqlmodel import SQLModel as _SQLModel
 
+# Stay below SQLite's host parameter limit when building `IN (...)` clauses
+MAX_QUERY_PARAMETERS = 900
+
 
 def snake_case(name: str) -> str:
     name = name.strip().replace("-", "_").replace(" ", "_")
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlmodel import Field, Session, select
+
+from synda.model.utils import MAX_QUERY_PARAMETERS, SQLModel
+from synda.utils.iterables import batched
+
+
+class ValueHash(SQLModel, table=True):
+    """
+    Hash of a value already produced, shared by every run using the same index
+    """
+
+    index_name: str = Field(primary_key=True)
+    hash: str = Field(primary_key=True)
+    run_id: int | None = Field(default=None, foreign_key="run.id")
+    created_at: datetime = Field(default_factory=datetime.now)
+
+    @staticmethod
+    def get_existing(session: Session, index_name: str, hashes: list[str]) -> set[str]:
+        existing = set()
+
+        for chunk in batched(hashes, MAX_QUERY_PARAMETERS):
+            existing.update(
+                session.exec(
+                    select(ValueHash.hash).where(
+                        ValueHash.index_name == index_name,
+                        ValueHash.hash.in_(chunk),  # noqa
+                    )
+                )
+            )
+
+        return existing
+
+    @staticmethod
+    def add_many(
+        session: Session, index_name: str, hashes: list[str], run_id: int | None
+    ) -> None:
+        """
+        Left uncommitted, the hashes are recorded with the nodes of the step
+        that produced them or not at all
+        """
+        if not hashes:
+            return
+
+        created_at = datetime.now()
+        session.execute(
+            insert(ValueHash).prefix_with("OR IGNORE"),
+            [
+                {
+                    "index_name": index_name,
+                    "hash": hash_,
+                    "run_id": run_id,
+                    "created_at": created_at,
+                }
+                for hash_ in hashes
+            ],
+        )
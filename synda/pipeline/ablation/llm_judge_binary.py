@@ -1,5 +1,4 @@
 import json
-import asyncio
 from typing import Literal, Optional
 
 from pydantic import BaseModel
@@ -11,6 +10,7 @@ from synda.model.step import Step
 from synda.pipeline.executor import Executor
 from synda.model.node import Node
 from synda.progress_manager import ProgressManager
+from synda.utils.async_engine import AsyncEngine
 from synda.utils.env import is_debug_enabled
 from synda.utils.llm_provider import LLMProvider
 from synda.utils.prompt_builder import PromptBuilder
@@ -30,14 +30,25 @@ class LLMJudgeBinary(Executor):
         self.progress = ProgressManager("ABLATION")
         self.provider = Provider.get(self.config.parameters.provider)
         self.model = self.config.parameters.model
+        self.rpm = self.config.parameters.rpm or self.provider.rpm
+        self.tpm = self.config.parameters.tpm or self.provider.tpm
         self.batch = self.config.parameters.batch
         self.batch_size = self.config.parameters.batch_size
+        self.concurrency = (
+            self.config.parameters.concurrency
+            or run.get_execution_config().concurrency
+            or self.batch_size
+        )
+        self.criteria_templates = [
+            PromptBuilder.compile(criterion)
+            for criterion in self.config.parameters.criteria
+        ]
 
     def execute(self, pending_nodes: list[Node], processed_nodes: list[Node]):
         criteria = self.config.parameters.criteria
         result = processed_nodes or []
 
-        if not self.batch or self.batch_size is None:
+        if not self.batch or self.concurrency is None:
             result = self._execute_sequential(pending_nodes, processed_nodes, criteria)
         else:
             result = self._execute_batch(pending_nodes, processed_nodes, criteria)
@@ -52,8 +63,9 @@ class LLMJudgeBinary(Executor):
             (len(pending_nodes) + len(processed_nodes)) * len(criteria),
             completed=len(processed_nodes) * len(criteria),
         ) as advance_node:
-            for node in pending_nodes:
-                judge_answers = self._evaluate_node_criteria(node, criteria, advance_node)
+            criteria_prompts = self._build_criteria_prompts(pending_nodes)
+            for node, node_criteria_prompts in zip(pending_nodes, criteria_prompts):
+                judge_answers = self._evaluate_node_criteria(node, node_criteria_prompts, advance_node)
                 result_node = self._create_result_node(node, judge_answers)
                 result.append(result_node)
                 
@@ -63,26 +75,59 @@ class LLMJudgeBinary(Executor):
 
     def _execute_batch(self, pending_nodes: list[Node], processed_nodes: list[Node], criteria: list[str]) -> list[Node]:
         result = processed_nodes or []
-        num_batches = (len(pending_nodes) + self.batch_size - 1) // self.batch_size
+        criteria_prompts = self._build_criteria_prompts(pending_nodes)
+        judge_items = [
+            (node_index, criterion_index, criterion_prompt)
+            for node_index, node_criteria_prompts in enumerate(criteria_prompts)
+            for criterion_index, criterion_prompt in enumerate(node_criteria_prompts)
+        ]
+        judge_answers = [[None] * len(criteria) for _ in pending_nodes]
+        remaining_answers = [len(criteria)] * len(pending_nodes)
+        result_nodes = [None] * len(pending_nodes)
+
         with self.progress.task(
             "  Ablating...",
-            num_batches,
+            len(judge_items),
             completed=0,
         ) as advance_node:
-            loop = asyncio.get_event_loop()
-            for i in range(0, len(pending_nodes), self.batch_size):
-                batch_nodes = pending_nodes[i:i + self.batch_size]
-                tasks = [self._judge_node_async(node, criteria) for node in batch_nodes]
-                result_nodes = loop.run_until_complete(asyncio.gather(*tasks))
-                result.extend(result_nodes)
+            def on_done(index: int, judge_answer: LLMJudgeCriterionBinaryAnswer) -> None:
+                node_index, criterion_index, _ = judge_items[index]
+                judge_answers[node_index][criterion_index] = judge_answer
+                remaining_answers[node_index] -= 1
+
+                if remaining_answers[node_index] == 0:
+                    node = pending_nodes[node_index]
+                    result_nodes[node_index] = self._create_result_node(node, judge_answers[node_index])
+                    self._log_debug_info(node, criteria, judge_answers[node_index], result_nodes[node_index])
                 advance_node()
-                
+
+            AsyncEngine(self.concurrency).map(
+                lambda item: self._judge_criterion_async(pending_nodes[item[0]], item[2]),
+                judge_items,
+                on_done=on_done,
+            )
+
+        # Nodes without any criterion never get an answer from the engine
+        for node_index, node in enumerate(pending_nodes):
+            if result_nodes[node_index] is None:
+                result_nodes[node_index] = self._create_result_node(node, [])
+
+        result.extend(result_nodes)
         return result
 
-    def _evaluate_node_criteria(self, node: Node, criteria: list[str], advance_callback=None) -> list[LLMJudgeCriterionBinaryAnswer]:
+    def _build_criteria_prompts(self, nodes: list[Node]) -> list[list[str]]:
+        prompts_by_criterion = [
+            [prompts[0] for prompts in PromptBuilder.build_batch(self.session, template, nodes)]
+            for template in self.criteria_templates
+        ]
+        return [
+            [criterion_prompts[i] for criterion_prompts in prompts_by_criterion]
+            for i in range(len(nodes))
+        ]
+
+    def _evaluate_node_criteria(self, node: Node, criteria_prompts: list[str], advance_callback=None) -> list[LLMJudgeCriterionBinaryAnswer]:
         judge_answers = []
-        for criterion in criteria:
-            criterion_prompt = PromptBuilder.build(self.session, criterion, [node])
+        for criterion_prompt in criteria_prompts:
             prompt = self._build_binary_judge_prompt(node.value, criterion_prompt)
             
             judge_answer = LLMProvider.call(
@@ -93,6 +138,9 @@ class LLMJudgeBinary(Executor):
                 LLMJudgeCriterionBinaryAnswer,
                 url=self.provider.api_url,
                 temperature=self.config.parameters.temperature,
+                rpm=self.rpm,
+                tpm=self.tpm,
+                cache=self.config.parameters.cache,
             )
             
             judge_answer = self._parse_judge_answer(judge_answer)
@@ -103,40 +151,28 @@ class LLMJudgeBinary(Executor):
                 
         return judge_answers
 
-    async def _judge_node_async(self, node: Node, criteria: list[str]) -> Node:
-        judge_answers = []
-        for criterion in criteria:
-            criterion_prompt = PromptBuilder.build(self.session, criterion, [node])
-            prompt = self._build_binary_judge_prompt(node.value, criterion_prompt)
-            
-            loop = asyncio.get_event_loop()
-            judge_answer_str = await loop.run_in_executor(
-                None,
-                lambda: LLMProvider.call(
-                    self.provider.name,
-                    self.model,
-                    self.provider.api_key,
-                    prompt,
-                    LLMJudgeCriterionBinaryAnswer,
-                    url=self.provider.api_url,
-                    temperature=self.config.parameters.temperature,
-                ),
-            )
-            
-            judge_answer = self._parse_judge_answer(judge_answer_str)
-            judge_answers.append(judge_answer)
-            
-        result_node = self._create_result_node(node, judge_answers)
-        self._log_debug_info(node, criteria, judge_answers, result_node)
-        
-        return result_node
+    async def _judge_criterion_async(self, node: Node, criterion_prompt: str) -> LLMJudgeCriterionBinaryAnswer:
+        prompt = self._build_binary_judge_prompt(node.value, criterion_prompt)
+        judge_answer_str = await LLMProvider.acall(
+            self.provider.name,
+            self.model,
+            self.provider.api_key,
+            prompt,
+            LLMJudgeCriterionBinaryAnswer,
+            url=self.provider.api_url,
+            temperature=self.config.parameters.temperature,
+            rpm=self.rpm,
+            tpm=self.tpm,
+            cache=self.config.parameters.cache,
+        )
+        return self._parse_judge_answer(judge_answer_str)
 
     def _create_result_node(self, node: Node, judge_answers: list[LLMJudgeCriterionBinaryAnswer]) -> Node:
         ablated = not self._check_consensus(judge_answers)
         result_node = Node(
             parent_node_id=node.id, value=node.value, ablated=ablated
         )
-        self.step_model.save_during_execution(self.session, node, result_node)
+        self.save_during_execution(node, result_node)
         return result_node
 
     def _parse_judge_answer(self, judge_answer_str: str) -> LLMJudgeCriterionBinaryAnswer:
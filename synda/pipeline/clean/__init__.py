@@ -1,2 +1,3 @@
 from .deduplicates_tf_idf import DeduplicateTFIDF
-from .deduplicates_embed import DeduplicateEmbed
\ No newline at end of file
+from .deduplicates_embed import DeduplicateEmbed
+from .deduplicates_minhash import DeduplicateMinHash
\ No newline at end of file
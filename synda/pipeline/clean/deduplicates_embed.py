@@ -1,4 +1,3 @@
-import itertools
 from typing import List
 from sqlmodel import Session
 from synda.model.run import Run
@@ -6,11 +5,13 @@ from synda.pipeline.executor import Executor
 from synda.model.node import Node
 from synda.progress_manager import ProgressManager
 from synda.model.step import Step
-from synda.utils.llm_provider import LLMProvider
+from synda.utils.embedding_cache import get_embedding_cache
+from synda.utils.similarity import greedy_cosine_deduplicate
 from synda.model.provider import Provider
-from sklearn.metrics.pairwise import cosine_similarity
 
 class DeduplicateEmbed(Executor):
+    requires_full_input = True
+
     def __init__(self, session: Session, run: Run, step_model: Step):
         super().__init__(session, run, step_model)
         self.progress = ProgressManager("CLEAN")
@@ -18,33 +19,52 @@ class DeduplicateEmbed(Executor):
         self.model = self.config.parameters.model
         self.api_key = self.provider.api_key
         self.api_url = self.provider.api_url
+        self.rpm = self.config.parameters.rpm or self.provider.rpm
+        self.tpm = self.config.parameters.tpm or self.provider.tpm
+        self.concurrency = (
+            self.config.parameters.concurrency
+            or run.get_execution_config().concurrency
+            or 4
+        )
 
     def execute(self, pending_nodes: List[Node], processed_nodes: List[Node]) -> List[Node]:
         similarity_threshold = self.config.parameters.similarity_threshold
         texts = [node.value for node in pending_nodes]
-        embeddings = LLMProvider.embedding(
+        if self.config.parameters.cache:
+            embeddings = get_embedding_cache().embed(
+                self.provider.name, self.model, texts, self._embed
+            )
+        else:
+            embeddings = self._embed(texts)
+        result_nodes = self._remove_embed_duplicates(pending_nodes, embeddings, similarity_threshold)
+        return [Node(parent_node_id=node.id, value=node.value) for node in result_nodes]
+
+    def _embed(self, texts: List[str]) -> List[list]:
+        # litellm is slow to import, the package exports the other clean steps too
+        from synda.utils.llm_provider import LLMProvider
+
+        return LLMProvider.embedding(
             provider=self.provider.name,
             model=self.model,
             api_key=self.api_key,
             texts=texts,
             url=self.api_url,
+            rpm=self.rpm,
+            tpm=self.tpm,
+            batch_size=self.config.parameters.batch_size,
+            max_batch_tokens=self.config.parameters.max_batch_tokens,
+            concurrency=self.concurrency,
+            max_retries=self.config.parameters.max_retries,
         )
-        result_nodes = self._remove_embed_duplicates(pending_nodes, embeddings, similarity_threshold)
-        return [Node(parent_node_id=node.id, value=node.value) for node in result_nodes]
 
-    @staticmethod
     def _remove_embed_duplicates(
-        pending_nodes: List[Node], embeddings: List[list], similarity_threshold: float
+        self, pending_nodes: List[Node], embeddings: List[list], similarity_threshold: float
     ) -> List[Node]:
-        keep_indices = set(range(len(pending_nodes)))
-        similarity_matrix = cosine_similarity(embeddings)
-        for i in range(len(pending_nodes)):
-            if i not in keep_indices:
-                continue
-            for j in range(i + 1, len(pending_nodes)):
-                if j not in keep_indices:
-                    continue
-                sim = similarity_matrix[i, j]
-                if sim > similarity_threshold:
-                    keep_indices.discard(j)
-        return [pending_nodes[i] for i in sorted(keep_indices)] 
\ No newline at end of file
+        with self.progress.task("  Cleaning...", len(pending_nodes)) as advance:
+            keep_indices = greedy_cosine_deduplicate(
+                embeddings,
+                similarity_threshold,
+                max_memory_mb=self.config.parameters.max_memory_mb,
+                advance=advance,
+            )
+        return [pending_nodes[i] for i in keep_indices]
@@ -0,0 +1,47 @@
+from sqlmodel import Session
+
+from synda.model.run import Run
+from synda.pipeline.executor import Executor
+from synda.model.node import Node
+from synda.progress_manager import ProgressManager
+from synda.model.step import Step
+from synda.utils.minhash import lsh_deduplicate, minhash_signatures
+
+
+class DeduplicateMinHash(Executor):
+    requires_full_input = True
+
+    def __init__(self, session: Session, run: Run, step_model: Step):
+        super().__init__(session, run, step_model)
+        self.progress = ProgressManager("CLEAN")
+
+    def execute(
+        self, pending_nodes: list[Node], processed_nodes: list[Node]
+    ) -> list[Node]:
+        parameters = self.config.parameters
+
+        with self.progress.task(
+            "  Cleaning...",
+            len(pending_nodes) + len(processed_nodes),
+            completed=len(processed_nodes),
+        ) as advance:
+            signatures = minhash_signatures(
+                [node.value for node in pending_nodes],
+                num_perm=parameters.bands * parameters.rows,
+                kind=parameters.shingle,
+                size=parameters.shingle_size,
+                seed=parameters.seed,
+                advance=advance,
+            )
+            kept_indices = lsh_deduplicate(
+                signatures,
+                bands=parameters.bands,
+                rows=parameters.rows,
+                threshold=parameters.similarity_threshold,
+                keep=parameters.keep,
+            )
+
+        return [
+            Node(parent_node_id=pending_nodes[i].id, value=pending_nodes[i].value)
+            for i in kept_indices
+        ]
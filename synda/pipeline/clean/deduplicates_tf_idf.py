@@ -1,4 +1,3 @@
-from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sqlmodel import Session
 
@@ -7,9 +6,14 @@ from synda.pipeline.executor import Executor
 from synda.model.node import Node
 from synda.progress_manager import ProgressManager
 from synda.model.step import Step
+from synda.model.value_hash import ValueHash
+from synda.utils.similarity import greedy_sparse_deduplicate
+from synda.utils.text import normalize_text, text_hash
 
 
 class DeduplicateTFIDF(Executor):
+    requires_full_input = True
+
     def __init__(self, session: Session, run: Run, step_model: Step):
         super().__init__(session, run, step_model)
         self.progress = ProgressManager("CLEAN")
@@ -32,62 +36,67 @@ class DeduplicateTFIDF(Executor):
                 )
             elif strategy == "fuzzy":
                 result_nodes = self._remove_fuzzy_duplicates(
-                    pending_nodes, similarity_threshold, keep, advance
+                    pending_nodes,
+                    similarity_threshold,
+                    keep,
+                    self.config.parameters.block_size,
+                    advance,
                 )
 
         return [Node(parent_node_id=node.id, value=node.value) for node in result_nodes]
 
-    @staticmethod
     def _remove_exact_duplicates(
-        pending_nodes: list[Node], keep: str, advance
+        self, pending_nodes: list[Node], keep: str, advance
     ) -> list[Node]:
-        seen_values = set()
-        result = []
+        parameters = self.config.parameters
+        hashes = [
+            text_hash(normalize_text(node.value, parameters.normalize))
+            for node in pending_nodes
+        ]
+        indices = range(len(pending_nodes))
+        if keep == "last":
+            indices = reversed(indices)
+
+        kept_index_by_hash = {}
+        for index in indices:
+            kept_index_by_hash.setdefault(hashes[index], index)
+            advance()
 
-        if keep == "first":
-            for node in pending_nodes:
-                if node.value not in seen_values:
-                    seen_values.add(node.value)
-                    result.append(node)
-                advance()
-        elif keep == "last":
-            for node in reversed(pending_nodes):
-                if node.value not in seen_values:
-                    seen_values.add(node.value)
-                    result.insert(0, node)
-                advance()
+        if parameters.cross_run:
+            known_hashes = ValueHash.get_existing(
+                self.session, parameters.index_name, list(kept_index_by_hash)
+            )
+            kept_index_by_hash = {
+                hash_: index
+                for hash_, index in kept_index_by_hash.items()
+                if hash_ not in known_hashes
+            }
+            # Committed along with the output nodes, a failed step rolls them back
+            ValueHash.add_many(
+                self.session,
+                parameters.index_name,
+                list(kept_index_by_hash),
+                self.run.id,
+            )
 
-        return result
+        return [pending_nodes[i] for i in sorted(kept_index_by_hash.values())]
 
     @staticmethod
     def _remove_fuzzy_duplicates(
-        pending_nodes: list[Node], similarity_threshold: float, keep: str, advance
+        pending_nodes: list[Node],
+        similarity_threshold: float,
+        keep: str,
+        block_size: int,
+        advance,
     ) -> list[Node]:
         node_values = [node.value for node in pending_nodes]
+        if not node_values:
+            return []
 
         vectorizer = TfidfVectorizer(strip_accents="unicode")
         tfidf_matrix = vectorizer.fit_transform(node_values)
-        similarity_matrix = cosine_similarity(tfidf_matrix)
-        index_node_to_keep = set(range(len(node_values)))
-
-        for node_index in range(len(node_values)):
-            if node_index not in index_node_to_keep:
-                advance()
-                continue
-
-            for compared_node_index in range(node_index + 1, len(node_values)):
-                if compared_node_index not in index_node_to_keep:
-                    continue
-                if (
-                    similarity_matrix[node_index, compared_node_index]
-                    > similarity_threshold
-                ):
-                    if keep == "first":
-                        index_node_to_keep.discard(compared_node_index)
-                    elif keep == "last":
-                        index_node_to_keep.discard(node_index)
-                        break
-
-            advance()
+        kept_indices = greedy_sparse_deduplicate(
+            tfidf_matrix, similarity_threshold, keep, block_size, advance
+        )
 
-        return [pending_nodes[i] for i in sorted(index_node_to_keep)]
+        return [pending_nodes[i] for i in kept_indices]
@@ -1,13 +1,21 @@
 from abc import abstractmethod
+from collections.abc import Callable, Iterable, Iterator
 
+from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import Session
 
 from synda.model.run import Run
 from synda.model.step import Step, StepStatus
 from synda.model.node import Node
+from synda.model.step_metrics import StepMetrics
+from synda.utils.iterables import batched
+from synda.utils.metrics import MetricsCollector
 
 
 class Executor:
+    # Barrier steps (e.g. deduplication) must see every node before emitting any
+    requires_full_input: bool = False
+
     def __init__(
         self,
         session: Session,
@@ -20,6 +28,10 @@ class Executor:
         self.step_model = step_model
         self.config = step_model.get_step_config()
         self.save_on_completion = save_on_completion
+        self.flush_size = run.get_execution_config().flush_size
+        self._unsaved_input_nodes: list[Node] = []
+        self._unsaved_output_nodes: list[Node] = []
+        self.metrics = MetricsCollector()
 
     def execute_and_update_step(
         self,
@@ -28,25 +40,110 @@ class Executor:
         restarted_step: bool = False,
     ) -> list[Node]:
         try:
-            self.step_model.set_running(
-                self.session, pending_nodes, restarted=restarted_step
-            )
-
-            output_nodes = self.execute(pending_nodes, processed_nodes)
-            if self.save_on_completion:
-                self.step_model.save_at_execution_end(
-                    self.session, pending_nodes, output_nodes
+            with self.metrics.active():
+                self.step_model.set_running(
+                    self.session, pending_nodes, restarted=restarted_step
                 )
-            else:
-                self.step_model.set_completed(session=self.session)
+
+                output_nodes = self.execute(pending_nodes, processed_nodes)
+                if self.save_on_completion:
+                    self.step_model.save_at_execution_end(
+                        self.session, pending_nodes, output_nodes
+                    )
+                else:
+                    self.flush()
+                    self.step_model.set_completed(session=self.session)
+
+                self.metrics.add_nodes(len(pending_nodes), len(output_nodes))
+            StepMetrics.create(self.session, self.step_model, self.metrics)
 
             filtered_nodes = [node for node in output_nodes if not node.ablated]
 
             return filtered_nodes
         except Exception as e:
-            self.step_model.set_status(self.session, StepStatus.ERRORED)
+            self._set_errored(e)
             raise e
 
+    def execute_stream(
+        self,
+        batches: Iterable[list[Node]],
+        batch_size: int,
+        advance: Callable[[int], None] | None = None,
+    ) -> Iterator[list[Node]]:
+        self.progress.disable()
+
+        if self.requires_full_input:
+            pending_nodes = [node for batch in batches for node in batch]
+            output_nodes = self.execute_and_update_step(pending_nodes, [])
+            for batch in batched(output_nodes, batch_size):
+                if advance:
+                    advance(len(batch))
+                yield batch
+            return
+
+        self.step_model.set_running(self.session, [])
+
+        try:
+            for pending_nodes in batches:
+                # Only the time spent on this step's batches, not upstream
+                with self.metrics.active():
+                    self.step_model.add_input_nodes(self.session, pending_nodes)
+                    output_nodes = self.execute(pending_nodes, [])
+                    if self.save_on_completion:
+                        self.step_model.save_batch(
+                            self.session, pending_nodes, output_nodes
+                        )
+                    else:
+                        self.flush()
+                    self.metrics.add_nodes(len(pending_nodes), len(output_nodes))
+
+                filtered_nodes = [node for node in output_nodes if not node.ablated]
+                if advance:
+                    advance(len(filtered_nodes))
+                if filtered_nodes:
+                    yield filtered_nodes
+        except BaseException as e:
+            # Raised by this step, by an upstream one while reading the next
+            # batch, or GeneratorExit when a downstream step failed and the
+            # stream is closed: the step stops unfinished either way
+            self._set_errored(e)
+            raise
+
+        self.step_model.set_completed(self.session)
+        StepMetrics.create(self.session, self.step_model, self.metrics)
+
+    def save_during_execution(self, input_node: Node, output_node: Node) -> None:
+        self._unsaved_input_nodes.append(input_node)
+        self._unsaved_output_nodes.append(output_node)
+
+        if len(self._unsaved_output_nodes) >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._unsaved_output_nodes:
+            return
+
+        self.step_model.save_batch(
+            self.session, self._unsaved_input_nodes, self._unsaved_output_nodes
+        )
+        self._unsaved_input_nodes = []
+        self._unsaved_output_nodes = []
+
+    def _set_errored(self, error: BaseException) -> None:
+        # The failure may come from the session itself, discard its transaction
+        self.session.rollback()
+
+        # Keep the nodes generated before the failure so a retry can skip them.
+        # After a database error they may hold ids of rolled back rows, and
+        # saving them must never hide the original error.
+        if not self.save_on_completion and not isinstance(error, SQLAlchemyError):
+            try:
+                self.flush()
+            except SQLAlchemyError:
+                self.session.rollback()
+        self.step_model.set_status(self.session, StepStatus.ERRORED)
+        StepMetrics.create(self.session, self.step_model, self.metrics)
+
     @abstractmethod
     def execute(self, pending_nodes: list[Node], processed_nodes: list[Node]):
         pass
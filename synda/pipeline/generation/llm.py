@@ -1,4 +1,3 @@
-import asyncio
 from sqlmodel import Session
 
 from synda.model.provider import Provider
@@ -6,8 +5,9 @@ from synda.model.run import Run
 from synda.model.step import Step
 from synda.pipeline.executor import Executor
 from synda.model.node import Node
+from synda.utils.async_engine import AsyncEngine
 from synda.utils.llm_provider import LLMProvider
-from synda.utils.prompt_builder import PromptBuilder
+from synda.utils.prompt_builder import CompiledTemplate, PromptBuilder
 from synda.progress_manager import ProgressManager
 
 
@@ -17,11 +17,23 @@ class LLM(Executor):
         self.progress = ProgressManager("GENERATION")
         self.provider = Provider.get(self.config.parameters.provider)
         self.model = self.config.parameters.model
+        self.rpm = self.config.parameters.rpm or self.provider.rpm
+        self.tpm = self.config.parameters.tpm or self.provider.tpm
         self.batch = self.config.parameters.batch
         self.batch_size = self.config.parameters.batch_size
+        self.concurrency = (
+            self.config.parameters.concurrency
+            or run.get_execution_config().concurrency
+            or self.batch_size
+        )
+        self.template = PromptBuilder.compile(
+            self.config.parameters.template,
+            instruction_sets=self.config.parameters.instruction_sets,
+            instruction_mode=self.config.parameters.instruction_mode,
+        )
 
     def execute(self, pending_nodes: list[Node], processed_nodes: list[Node]):
-        template = self.config.parameters.template
+        template = self.template
         occurrences = self.config.parameters.occurrences
         instruction_sets = self.config.parameters.instruction_sets
         instruction_mode = self.config.parameters.instruction_mode
@@ -29,22 +41,23 @@ class LLM(Executor):
 
         result = processed_nodes or []
 
-        if not self.batch or self.batch_size is None:
+        if not self.batch or self.concurrency is None:
             result = self._execute_sequential(pending_nodes, processed_nodes, template, instruction_sets, instruction_mode)
         else:
             result = self._execute_batch(pending_nodes, processed_nodes, template, instruction_sets, instruction_mode)
         
         return result
-    def _execute_sequential(self, pending_nodes: list[Node], processed_nodes: list[Node], template: str, instruction_sets: list, instruction_mode: str) -> list[Node]:
+    def _execute_sequential(self, pending_nodes: list[Node], processed_nodes: list[Node], template: CompiledTemplate, instruction_sets: list, instruction_mode: str) -> list[Node]:
         result = processed_nodes or []
         
+        node_prompts = self._build_prompts(pending_nodes, template, instruction_sets, instruction_mode)
+
         with self.progress.task(
             "Generating...",
             len(pending_nodes) + len(processed_nodes),
             completed=len(processed_nodes),
         ) as advance:
-            for node in pending_nodes:
-                prompts = self._build_prompts(node, template, instruction_sets, instruction_mode)
+            for node, prompts in zip(pending_nodes, node_prompts):
                 for prompt in prompts:
                     llm_answer = self._call_llm(prompt)
                     result_node = self._create_result_node(node, llm_answer, prompt)
@@ -53,48 +66,41 @@ class LLM(Executor):
                 
         return result
 
-    def _execute_batch(self, pending_nodes: list[Node], processed_nodes: list[Node], template: str, instruction_sets: list, instruction_mode: str) -> list[Node]:
+    def _execute_batch(self, pending_nodes: list[Node], processed_nodes: list[Node], template: CompiledTemplate, instruction_sets: list, instruction_mode: str) -> list[Node]:
         result = processed_nodes or []
         
         all_prompts = []
-        node_map = {}
-        for node in pending_nodes:
-            prompts = self._build_prompts(node, template, instruction_sets, instruction_mode)
+        node_prompts = self._build_prompts(pending_nodes, template, instruction_sets, instruction_mode)
+        for node, prompts in zip(pending_nodes, node_prompts):
             for prompt in prompts:
-                all_prompts.append(prompt)
-                node_map[prompt] = node
-                
-        num_batches = (len(all_prompts) + self.batch_size - 1) // self.batch_size
+                all_prompts.append((node, prompt))
+
+        result_nodes = [None] * len(all_prompts)
+
         with self.progress.task(
             "Generating...",
-            num_batches,
+            len(all_prompts),
             completed=0,
         ) as advance:
-            for i in range(0, len(all_prompts), self.batch_size):
-                batch_prompts = all_prompts[i:i + self.batch_size]
-                loop = asyncio.get_event_loop()
-                tasks = [
-                    loop.run_in_executor(
-                        None,
-                        self._call_llm,
-                        prompt
-                    )
-                    for prompt in batch_prompts
-                ]
-                responses = loop.run_until_complete(asyncio.gather(*tasks))
-                for prompt, response in zip(batch_prompts, responses):
-                    node = node_map[prompt]
-                    result_node = self._create_result_node(node, response, prompt)
-                    result.append(result_node)
+            def on_done(index: int, response: str) -> None:
+                node, prompt = all_prompts[index]
+                result_nodes[index] = self._create_result_node(node, response, prompt)
                 advance()
-                
+
+            AsyncEngine(self.concurrency).map(
+                lambda node_prompt: self._acall_llm(node_prompt[1]),
+                all_prompts,
+                on_done=on_done,
+            )
+            result.extend(result_nodes)
+
         return result
-        
-    def _build_prompts(self, node: Node, template: str, instruction_sets: list, instruction_mode: str) -> list[str]:
-        return PromptBuilder.build(
+
+    def _build_prompts(self, nodes: list[Node], template: CompiledTemplate, instruction_sets: list, instruction_mode: str) -> list[list[str]]:
+        return PromptBuilder.build_batch(
             self.session,
             template,
-            [node],
+            nodes,
             instruction_sets=instruction_sets,
             instruction_mode=instruction_mode
         )
@@ -107,8 +113,24 @@ class LLM(Executor):
             prompt,
             url=self.provider.api_url,
             temperature=self.config.parameters.temperature,
+            rpm=self.rpm,
+            tpm=self.tpm,
+            cache=self.config.parameters.cache,
         )
         
+    async def _acall_llm(self, prompt: str) -> str:
+        return await LLMProvider.acall(
+            self.provider.name,
+            self.model,
+            self.provider.api_key,
+            prompt,
+            url=self.provider.api_url,
+            temperature=self.config.parameters.temperature,
+            rpm=self.rpm,
+            tpm=self.tpm,
+            cache=self.config.parameters.cache,
+        )
+
     def _create_result_node(self, node: Node, value: str, metadata: str) -> Node:
         result_node = Node(
             parent_node_id=node.id,
@@ -116,7 +138,7 @@ class LLM(Executor):
             node_metadata=metadata,
             ancestors={'source': node.id}
         )
-        self.step_model.save_during_execution(self.session, node, result_node)
+        self.save_during_execution(node, result_node)
 
         return result_node
 
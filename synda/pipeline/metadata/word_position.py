@@ -1,5 +1,4 @@
-import re
-import unicodedata
+from functools import lru_cache
 
 from sqlmodel import Session
 
@@ -8,38 +7,52 @@ from synda.pipeline.executor import Executor
 from synda.model.node import Node
 from synda.progress_manager import ProgressManager
 from synda.model.step import Step
+from synda.utils.aho_corasick import AhoCorasick
 from synda.utils.prompt_builder import PromptBuilder
+from synda.utils.text import fold_text
 
 
 class WordPosition(Executor):
     def __init__(self, session: Session, run: Run, step_model: Step):
         super().__init__(session, run, step_model)
         self.progress = ProgressManager("METADATA")
+        self.match_templates = {
+            label: PromptBuilder.compile(pattern)
+            for label, pattern in self.config.parameters.matches.items()
+        }
 
     def execute(self, pending_nodes: list[Node], processed_nodes: list[Node]):
         result = []
-        matches = self.config.parameters.matches
+        labels = list(self.match_templates)
+        all_occurrences = self.config.parameters.occurrences == "all"
+
+        label_patterns = [
+            [
+                prompts[0]
+                for prompts in PromptBuilder.build_batch(
+                    self.session, template, pending_nodes
+                )
+            ]
+            for template in self.match_templates.values()
+        ]
 
         with self.progress.task("  Metadata...", len(pending_nodes)) as advance:
-            for node in pending_nodes:
-                metadata = []
-                text = node.value
-
-                for label, pattern in matches.items():
-                    pattern = PromptBuilder.build(self.session, pattern, [node])
-                    regex_pattern = self._create_pattern_ignoring_case_and_accents(
-                        pattern
-                    )
-                    match = re.search(regex_pattern, text)
+            for index, node in enumerate(pending_nodes):
+                patterns = tuple(
+                    fold_text(patterns[index])[0] for patterns in label_patterns
+                )
+                matches = self._find_matches(node.value, patterns, all_occurrences)
 
-                    if match:
-                        metadata_entry = {
-                            "label": label,
-                            "start": match.start(),
-                            "end": match.end(),
-                            "value": match.group(),
-                        }
-                        metadata.append(metadata_entry)
+                metadata = [
+                    {
+                        "label": labels[label_index],
+                        "start": start,
+                        "end": end,
+                        "value": node.value[start:end],
+                    }
+                    for label_index, label_matches in enumerate(matches)
+                    for start, end in label_matches
+                ]
 
                 result.append(
                     Node(
@@ -51,9 +64,39 @@ class WordPosition(Executor):
         return result
 
     @staticmethod
-    def _create_pattern_ignoring_case_and_accents(pattern: str) -> str:
-        pattern = pattern.lower()
-        pattern = unicodedata.normalize("NFKD", pattern)
-        pattern = "".join(c for c in pattern if ord(c) < 128)
-        pattern = re.escape(pattern)
-        return f"(?i){pattern}"
+    def _find_matches(
+        text: str, patterns: tuple[str, ...], all_occurrences: bool
+    ) -> list[list[tuple[int, int]]]:
+        """
+        (start, end) offsets in `text` of the occurrences of each folded
+        pattern, the leftmost one only unless `all_occurrences`
+        """
+        automaton = _build_automaton(patterns)
+
+        folded_text, offsets = fold_text(text)
+        matches: list[list[tuple[int, int]]] = [[] for _ in patterns]
+
+        for start, label_index in sorted(automaton.iter(folded_text)):
+            label_matches = matches[label_index]
+            end = start + automaton.lengths[label_index]
+            if label_matches and (
+                not all_occurrences or start < label_matches[-1][1]
+            ):
+                # Keep the leftmost match, then non-overlapping ones
+                continue
+            label_matches.append((start, end))
+
+        if offsets is None:
+            return matches
+
+        return [
+            [(offsets[start], offsets[end - 1] + 1) for start, end in label_matches]
+            for label_matches in matches
+        ]
+
+
+# Static patterns keep hitting one automaton, templated ones rendered per
+# node would otherwise pile up one per distinct value
+@lru_cache(maxsize=64)
+def _build_automaton(patterns: tuple[str, ...]) -> AhoCorasick:
+    return AhoCorasick(list(patterns))
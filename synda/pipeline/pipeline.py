@@ -1,15 +1,20 @@
+from collections.abc import Iterable
 from functools import wraps
+from itertools import chain
 from typing import TYPE_CHECKING, Optional
 
 from rich.console import Console
 from rich.markup import escape
 from sqlmodel import Session
 
-from synda.database import engine
+from synda.database import get_engine, get_run_engine, get_storage
 from synda.model.node import Node, NodeStatus
 from synda.model.run import Run, RunStatus
-from synda.model.step import Step
+from synda.model.step import Step, StepStatus
+from synda.progress_manager import StreamProgressManager
+from synda.utils.output_writer import OutputWriter
 from synda.utils.env import is_debug_enabled
+from synda.utils.iterables import batched
 
 if TYPE_CHECKING:
     from synda.config import Config
@@ -19,11 +24,19 @@ CONSOLE = Console()
 
 class Pipeline:
     def __init__(self, config: Optional["Config"] = None):
-        self.session = Session(engine)
+        # Nodes are written in bulk, keep their loaded state instead of
+        # reloading every row after each commit
+        self.session = Session(get_engine(), expire_on_commit=False)
         self.config = config
         self.pipeline = config.pipeline if config else None
         self.run = Run.create_with_steps(self.session, config) if config else None
 
+        if self.run is not None:
+            shard_run = config.execution.shard_run
+            if shard_run is None:
+                shard_run = get_storage().shard_runs
+            self._open_run_session(self.run.id, create=shard_run)
+
     @staticmethod
     def handle_run_errors(func):
         """Decorator to handle run errors gracefully."""
@@ -74,14 +87,64 @@ class Pipeline:
         if self.config is None:
             raise ValueError("Config can't be None to execute a pipeline")
 
-        input_nodes = self.config.input.load_nodes(self.session)
-
-        for step in self.run.steps:
-            self._log_debug_info(step)
-            executor = step.get_step_config().get_executor(self.session, self.run, step)
-            input_nodes = executor.execute_and_update_step(input_nodes, [], False)
+        with self.config.output.open_writer() as writer:
+            if self.config.execution.streaming:
+                self._execute_streaming(
+                    self.config.input.stream_nodes(self.session),
+                    self.run.steps,
+                    writer,
+                )
+            else:
+                input_nodes = self.config.input.load_nodes(self.session)
+                for step in self.run.steps:
+                    self._log_debug_info(step)
+                    executor = step.get_step_config().get_executor(
+                        self.session, self.run, step
+                    )
+                    input_nodes = executor.execute_and_update_step(
+                        input_nodes, [], False
+                    )
+                self._write_output(writer, input_nodes)
+
+            self._finalize_run(writer)
+
+    def _execute_streaming(
+        self,
+        input_batches: Iterable[list[Node]],
+        steps: list[Step],
+        writer: OutputWriter,
+        unread_nodes: dict[int, list[Node]] | None = None,
+    ) -> None:
+        batch_size = self.config.execution.batch_size
+        progress = StreamProgressManager()
+
+        with progress.live():
+            stream = batched(
+                (node for nodes in input_batches for node in nodes), batch_size
+            )
+            step_streams = []
+            for step in steps:
+                self._log_debug_info(step)
+                # Nodes a restarted step never read before its upstream output
+                backlog = (unread_nodes or {}).get(step.id, [])
+                stream = chain(batched(backlog, batch_size), stream)
+                executor = step.get_step_config().get_executor(
+                    self.session, self.run, step
+                )
+                stream = executor.execute_stream(
+                    stream, batch_size, progress.tracker(step.type, step.name)
+                )
+                step_streams.append(stream)
 
-        self._finalize_run(input_nodes)
+            try:
+                # Final nodes are appended to the output as soon as they are produced
+                for batch in stream:
+                    writer.write(batch)
+            finally:
+                # After a failure the steps before the failed one are left
+                # suspended, closing them records their status right away
+                for step_stream in reversed(step_streams):
+                    step_stream.close()
 
     @handle_run_errors
     @handle_stop_option
@@ -101,17 +164,84 @@ class Pipeline:
         resumed_step = Step.get_step_to_resume(session=self.session, run_id=run_id)
         self._restart_from_step(resumed_step)
 
+    def _open_run_session(self, run_id: int, create: bool = False) -> None:
+        """
+        Move to the database holding the nodes of the run, which also sees
+        the catalog tables
+        """
+        engine = get_run_engine(run_id, create=create)
+        if engine is self.session.get_bind():
+            return
+
+        self.session.close()
+        self.session = Session(engine, expire_on_commit=False)
+        if self.run is not None:
+            self.run = self.session.get(Run, self.run.id)
+
     def _restart_from_step(self, step: Step):
         from synda.config import Config
 
+        self._open_run_session(step.run_id)
+        step = self.session.get(Step, step.id)
+        run = Run.get_from_step(self.session, step)
+        if run.get_execution_config().streaming:
+            self._restart_streaming(run)
+            return
+
         self.run, input_nodes, remaining_steps = Run.restart_from_step(
             session=self.session, step=step
         )
         self.config = Config.model_validate(self.run.config)
 
-        self._execute_remaining_steps(input_nodes, remaining_steps)
+        with self.config.output.open_writer() as writer:
+            output_nodes = self._execute_remaining_steps(input_nodes, remaining_steps)
+            self._write_output(writer, output_nodes)
+            self._finalize_run(writer)
+
+    def _restart_streaming(self, run: Run) -> None:
+        """
+        Streamed steps stop with part of their input unread, whichever step
+        failed. Every unfinished step restarts on the nodes it never read,
+        then on the new output of the step before it.
+        """
+        from synda.config import Config
 
-        self._finalize_run(input_nodes)
+        self.run = run.update(self.session, RunStatus.RUNNING)
+        self.config = Config.model_validate(self.run.config)
+        remaining_steps = [
+            step for step in self.run.steps if step.status != StepStatus.COMPLETED
+        ]
+
+        input_batches, unread_nodes = iter(()), {}
+        for step in remaining_steps:
+            if step.position == 1:
+                read_count = len(Node.get_input_nodes_from_step(self.session, step))
+                unread_nodes[step.id] = step.unmap_pending_input_nodes(self.session)
+                input_batches = self.config.input.stream_nodes(
+                    self.session, skip=read_count
+                )
+                continue
+
+            step.unmap_pending_input_nodes(self.session)
+            previous_step = self.run.steps[step.position - 2]
+            unread_nodes[step.id] = [
+                node
+                for node in Node.get_output_nodes_from_step(self.session, previous_step)
+                if node.status == NodeStatus.PENDING and not node.ablated
+            ]
+
+        produced_nodes = [
+            node
+            for node in Node.get_output_nodes_from_step(self.session, self.run.steps[-1])
+            if not node.ablated
+        ]
+
+        with self.config.output.open_writer() as writer:
+            # The partial output file is rewritten from scratch
+            for batch in batched(produced_nodes, self.config.execution.batch_size):
+                writer.write(batch)
+            self._execute_streaming(input_batches, remaining_steps, writer, unread_nodes)
+            self._finalize_run(writer)
 
     def _execute_remaining_steps(self, input_nodes, remaining_steps):
         is_first_remaining_step = True
@@ -153,9 +283,13 @@ class Pipeline:
         if is_debug_enabled():
             print(step)
 
-    def _finalize_run(self, input_nodes: list[Node]) -> None:
+    def _write_output(self, writer: OutputWriter, nodes: list[Node]) -> None:
+        for batch in batched(nodes, self.config.execution.batch_size):
+            writer.write(batch)
+
+    def _finalize_run(self, writer: OutputWriter) -> None:
         if self.config is None or self.run is None:
             raise ValueError("Config and run can't be None to finalize a pipeline")
-        self.config.output.save_output(nodes=input_nodes)
+        writer.commit()
         self.run.update(self.session, RunStatus.FINISHED)
         CONSOLE.print(f"[green]Run {self.run.id} finished successfully!")
@@ -1,3 +1,5 @@
+from collections.abc import Iterator
+
 from sqlmodel import Session
 
 from synda.model.run import Run
@@ -5,6 +7,7 @@ from synda.pipeline.executor import Executor
 from synda.model.node import Node
 from synda.progress_manager import ProgressManager
 from synda.model.step import Step
+from synda.utils.tokenizer import token_offsets
 
 
 class Chunk(Executor):
@@ -14,17 +17,47 @@ class Chunk(Executor):
 
     def execute(self, pending_nodes: list[Node], processed_nodes: list[Node]):
         result = []
-        size = self.config.parameters.size
 
         with self.progress.task("  Chunking...", len(pending_nodes)) as advance:
             for node in pending_nodes:
                 text = node.value
 
-                while text:
-                    chunk = text[:size]
-                    text = text[size:]
-                    result.append(Node(parent_node_id=node.id, value=chunk))
+                for index, (start, end) in enumerate(self._chunk_offsets(text)):
+                    result.append(
+                        Node(
+                            parent_node_id=node.id,
+                            value=text[start:end],
+                            node_metadata=[
+                                {"chunk_index": index, "start": start, "end": end}
+                            ],
+                        )
+                    )
 
                 advance()
 
         return result
+
+    def _chunk_offsets(self, text: str) -> Iterator[tuple[int, int]]:
+        """
+        Character (start, end) offsets of each chunk of `text`
+        """
+        parameters = self.config.parameters
+
+        if parameters.unit == "tokens":
+            # Chunk boundaries fall on token starts, the last one ends the text
+            boundaries = token_offsets(text, parameters.encoding) + [len(text)]
+        else:
+            boundaries = None
+
+        length = len(boundaries) - 1 if boundaries is not None else len(text)
+        step = parameters.size - parameters.overlap
+
+        for start in range(0, length, step):
+            end = min(start + parameters.size, length)
+            if boundaries is not None:
+                yield boundaries[start], boundaries[end]
+            else:
+                yield start, end
+
+            if end == length:
+                break
@@ -1,3 +1,5 @@
+import re
+
 from sqlmodel import Session
 
 from synda.model.run import Run
@@ -6,36 +8,66 @@ from synda.model.node import Node
 from synda.progress_manager import ProgressManager
 from synda.model.step import Step
 
+# Terminal punctuation, closing quotes and brackets, then the end of the text
+# or a whitespace run followed by anything but a lowercase letter. Requiring a
+# non-space after the run keeps it from backtracking to a shorter one.
+SENTENCE_END_PATTERN = r"[.!?…]*[\"'»”)\]]*(?:\s+(?=[^a-zà-ÿ\s])|\s*$)"
+
 
 class Separator(Executor):
     def __init__(self, session: Session, run: Run, step_model: Step):
         super().__init__(session, run, step_model)
         self.progress = ProgressManager("SPLIT")
+        self.pattern = self._compile_pattern()
 
     def execute(self, pending_nodes: list[Node], processed_nodes: list[Node]):
-        result = []
-        separator = self.config.parameters.separator
-        keep_separator = self.config.parameters.keep_separator
-
         with self.progress.task("Separating...", len(pending_nodes)) as advance:
-            for node in pending_nodes:
-                text = node.value
-                start = 0
-                pos = text.find(separator)
+            result = [
+                Node(parent_node_id=node.id, value=chunk)
+                for node in pending_nodes
+                for chunk in self._split(node.value)
+            ]
+            advance(len(pending_nodes))
 
-                while pos != -1:
-                    chunk_end = pos + len(separator) if keep_separator else pos
-                    chunk = text[start:chunk_end]
+        return result
 
-                    if chunk:
-                        result.append(Node(parent_node_id=node.id, value=chunk))
+    def _split(self, value: str) -> list[str]:
+        keep_separator = self.config.parameters.keep_separator
+        chunks, start = [], 0
 
-                    start = pos + len(separator)
-                    pos = text.find(separator, start)
+        for match in self.pattern.finditer(value):
+            end = match.end() if keep_separator else match.start()
+            chunks.append(value[start:end])
+            start = match.end()
+        chunks.append(value[start:])
 
-                if start < len(text):
-                    result.append(Node(parent_node_id=node.id, value=text[start:]))
+        if self.config.parameters.mode == "sentence":
+            chunks = [chunk.strip() for chunk in chunks]
+        return [chunk for chunk in chunks if chunk]
 
-                advance()
+    def _compile_pattern(self) -> re.Pattern:
+        parameters = self.config.parameters
+        separators = (
+            [parameters.separator]
+            if isinstance(parameters.separator, str)
+            else parameters.separator
+        )
 
-        return result
+        match parameters.mode:
+            case "literal":
+                # Longest first, so that ".." wins over "."
+                separators = sorted(separators, key=len, reverse=True)
+                return re.compile("|".join(re.escape(s) for s in separators))
+            case "regex":
+                return re.compile("|".join(f"(?:{s})" for s in separators))
+            case "sentence":
+                # A period after an abbreviation or an initial ends no sentence.
+                # Leading with the punctuation keeps the lookbehinds off the
+                # positions that cannot end a sentence anyway.
+                not_abbreviation = "".join(
+                    rf"(?<!\b{re.escape(abbreviation)}\.)"
+                    for abbreviation in parameters.abbreviations
+                )
+                return re.compile(
+                    rf"[.!?…]{not_abbreviation}(?<!\b[A-Z]\.){SENTENCE_END_PATTERN}"
+                )
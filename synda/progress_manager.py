@@ -1,3 +1,4 @@
+from collections.abc import Callable
 from enum import Enum
 from rich.progress import (
     Progress,
@@ -41,4 +42,27 @@ class ProgressManager:
             task_id = progress.add_task(
                 description, total=total, transient=transient, completed=completed
             )
-            yield lambda: progress.advance(task_id)
+            yield lambda count=1: progress.advance(task_id, count)
+
+    def disable(self) -> None:
+        self.progress.disable = True
+
+
+class StreamProgressManager:
+    def __init__(self):
+        self.progress = Progress(
+            SpinnerColumn(speed=2),
+            TextColumn("{task.description}", justify="right"),
+            TextColumn("{task.completed:.0f} nodes"),
+            TimeElapsedColumn(),
+        )
+
+    @contextmanager
+    def live(self):
+        with self.progress:
+            yield self
+
+    def tracker(self, executor_type: str, description: str) -> Callable[[int], None]:
+        color = ExecutorColor[executor_type.upper()].value
+        task_id = self.progress.add_task(f"[{color}]{description}", total=None)
+        return lambda count: self.progress.advance(task_id, count)
@@ -0,0 +1,64 @@
+from collections import deque
+from collections.abc import Iterator
+
+
+class AhoCorasick:
+    """
+    Automaton finding every occurrence of several patterns in one pass
+    """
+
+    def __init__(self, patterns: list[str]):
+        self.lengths = [len(pattern) for pattern in patterns]
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._outputs: list[list[int]] = [[]]
+
+        for index, pattern in enumerate(patterns):
+            if pattern:
+                self._insert(pattern, index)
+        self._link_failures()
+
+    def iter(self, text: str) -> Iterator[tuple[int, int]]:
+        """
+        Yield (start, pattern index) of each occurrence, ordered by end offset
+        """
+        goto, fail, outputs, lengths = (
+            self._goto,
+            self._fail,
+            self._outputs,
+            self.lengths,
+        )
+        state = 0
+
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for index in outputs[state]:
+                yield position - lengths[index] + 1, index
+
+    def _insert(self, pattern: str, index: int) -> None:
+        state = 0
+        for char in pattern:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        self._outputs[state].append(index)
+
+    def _link_failures(self) -> None:
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._outputs[next_state] += self._outputs[self._fail[next_state]]
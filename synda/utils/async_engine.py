@@ -0,0 +1,73 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Single event loop reused by every step, so async HTTP clients stay bound to it
+    """
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop
+
+
+class AsyncEngine:
+    """
+    Keeps up to `concurrency` coroutines in flight (sliding window): a new one
+    starts as soon as any finishes, instead of waiting for a whole batch.
+    """
+
+    def __init__(self, concurrency: int):
+        if concurrency < 1:
+            raise ValueError(f"Concurrency must be positive, got {concurrency}")
+        self.concurrency = concurrency
+
+    def map(
+        self,
+        func: Callable[[T], Awaitable[R]],
+        items: Sequence[T],
+        on_done: Callable[[int, R], Any] | None = None,
+    ) -> list[R]:
+        """
+        Run `func` over `items` and return the results in the items order.
+        `on_done(index, result)` is called as soon as each item completes.
+        """
+        return get_event_loop().run_until_complete(
+            self._map(func, items, on_done)
+        )
+
+    async def _map(
+        self,
+        func: Callable[[T], Awaitable[R]],
+        items: Sequence[T],
+        on_done: Callable[[int, R], Any] | None,
+    ) -> list[R]:
+        results: list[R | None] = [None] * len(items)
+        pending_items = iter(enumerate(items))
+
+        async def worker():
+            for index, item in pending_items:
+                results[index] = await func(item)
+                if on_done is not None:
+                    on_done(index, results[index])
+
+        workers = [
+            asyncio.ensure_future(worker())
+            for _ in range(min(self.concurrency, len(items)))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+
+        return results
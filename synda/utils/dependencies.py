@@ -0,0 +1,14 @@
+import importlib
+from types import ModuleType
+
+
+def import_optional(module: str, extra: str, feature: str) -> ModuleType:
+    """
+    Import a module from one of synda's optional extras
+    """
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(
+            f"{feature} requires the '{extra}' extra: pip install 'synda[{extra}]'"
+        ) from e
@@ -0,0 +1,115 @@
+import sqlite3
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from synda.model.utils import MAX_QUERY_PARAMETERS
+from synda.utils.text import text_hash
+
+
+class EmbeddingCache:
+    """
+    Embeddings stored as float32 blobs, keyed by (provider, model, text hash)
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embedding ("
+            "provider TEXT NOT NULL, model TEXT NOT NULL, text_hash TEXT NOT NULL, "
+            "vector BLOB NOT NULL, PRIMARY KEY (provider, model, text_hash))"
+        )
+
+    def embed(
+        self,
+        provider: str,
+        model: str,
+        texts: list[str],
+        embed_missing: Callable[[list[str]], list[list[float]]],
+    ) -> np.ndarray:
+        """
+        Return the embeddings of `texts` as a matrix, only sending the texts
+        never embedded before to `embed_missing`
+        """
+        hashes = [text_hash(text) for text in texts]
+        row_by_hash, vectors = self.load(provider, model, list(dict.fromkeys(hashes)))
+
+        missing = {
+            hash_: text
+            for hash_, text in zip(hashes, texts)
+            if hash_ not in row_by_hash
+        }
+        if missing:
+            missing_vectors = np.asarray(
+                embed_missing(list(missing.values())), dtype=np.float32
+            )
+            self.save(provider, model, list(missing), missing_vectors)
+
+            offset = len(row_by_hash)
+            row_by_hash.update(
+                (hash_, offset + row) for row, hash_ in enumerate(missing)
+            )
+            vectors = (
+                missing_vectors
+                if vectors is None
+                else np.vstack([vectors, missing_vectors])
+            )
+
+        if vectors is None:
+            return np.empty((0, 0), dtype=np.float32)
+
+        return vectors[[row_by_hash[hash_] for hash_ in hashes]]
+
+    def load(
+        self, provider: str, model: str, hashes: list[str]
+    ) -> tuple[dict[str, int], np.ndarray | None]:
+        row_by_hash, blobs = {}, []
+
+        with self._lock:
+            for start in range(0, len(hashes), MAX_QUERY_PARAMETERS):
+                chunk = hashes[start : start + MAX_QUERY_PARAMETERS]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    "SELECT text_hash, vector FROM embedding "
+                    f"WHERE provider = ? AND model = ? AND text_hash IN ({placeholders})",
+                    (provider, model, *chunk),
+                )
+                for hash_, blob in rows:
+                    row_by_hash[hash_] = len(blobs)
+                    blobs.append(blob)
+
+        if not blobs:
+            return row_by_hash, None
+
+        vectors = np.frombuffer(b"".join(blobs), dtype=np.float32)
+        return row_by_hash, vectors.reshape(len(blobs), -1)
+
+    def save(
+        self, provider: str, model: str, hashes: list[str], vectors: np.ndarray
+    ) -> None:
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embedding VALUES (?, ?, ?, ?)",
+                (
+                    (provider, model, hash_, vector.tobytes())
+                    for hash_, vector in zip(hashes, vectors)
+                ),
+            )
+            self._connection.commit()
+
+
+_embedding_cache: EmbeddingCache | None = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _embedding_cache
+    if _embedding_cache is None:
+        from synda.database import get_synda_dir
+
+        _embedding_cache = EmbeddingCache(get_synda_dir() / "embedding_cache.db")
+    return _embedding_cache
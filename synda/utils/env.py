@@ -8,3 +8,15 @@ load_dotenv()
 
 def is_debug_enabled() -> bool:
     return os.getenv("DEBUG_ENABLED", False) == "true"
+
+
+def get_cache_max_size_mb() -> int:
+    return int(os.getenv("SYNDA_CACHE_MAX_SIZE_MB") or 1024)
+
+
+def get_cache_ttl_days() -> float | None:
+    """
+    Days before a cached LLM response expires, 0 keeps them until evicted by size
+    """
+    ttl_days = float(os.getenv("SYNDA_CACHE_TTL_DAYS") or 30)
+    return ttl_days if ttl_days > 0 else None
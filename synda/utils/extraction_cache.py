@@ -0,0 +1,58 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+
+class ExtractionCache:
+    """
+    Values extracted from input files, keyed by (file content hash, extraction
+    key) so that unchanged files are never parsed twice
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS extraction ("
+            "file_hash TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+            "PRIMARY KEY (file_hash, key))"
+        )
+
+    @staticmethod
+    def file_hash(path: Path) -> str:
+        with path.open("rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    def get(self, file_hash: str, key: str) -> Any | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM extraction WHERE file_hash = ? AND key = ?",
+                (file_hash, key),
+            ).fetchone()
+
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, file_hash: str, key: str, value: Any) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO extraction VALUES (?, ?, ?)",
+                (file_hash, key, json.dumps(value, ensure_ascii=False)),
+            )
+            self._connection.commit()
+
+
+_extraction_cache: ExtractionCache | None = None
+
+
+def get_extraction_cache() -> ExtractionCache:
+    global _extraction_cache
+    if _extraction_cache is None:
+        from synda.database import get_synda_dir
+
+        _extraction_cache = ExtractionCache(get_synda_dir() / "extraction_cache.db")
+    return _extraction_cache
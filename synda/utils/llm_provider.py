@@ -1,6 +1,24 @@
-from litellm import completion, embedding
+import asyncio
+import time
+
+from litellm import (
+    APIConnectionError,
+    APIError,
+    InternalServerError,
+    RateLimitError,
+    ServiceUnavailableError,
+    Timeout,
+    acompletion,
+    aembedding,
+    completion,
+)
 from pydantic import BaseModel
 
+from synda.utils import metrics
+from synda.utils.async_engine import AsyncEngine
+from synda.utils.rate_limiter import estimate_tokens, get_rate_limiter
+from synda.utils.response_cache import CacheMode, ResponseCache, get_response_cache
+
 
 class LLMProvider:
     @staticmethod
@@ -13,22 +31,76 @@ class LLMProvider:
         url: str | None = None,
         format: str | None = None,
         temperature: float = 1.0,
+        rpm: int | None = None,
+        tpm: int | None = None,
+        cache: CacheMode = CacheMode.OFF,
     ) -> str:
-        provider = LLMProvider._resolve_provider(provider)
-        params = {
-            "model": f"{provider}/{model}",
-            "messages": [{"content": prompt, "role": "user"}],
-            "api_key": api_key,
-            "api_base": url,
-            "response_format": response_format,
-            "temperature": temperature,
-        }
-        if format:
-            params["format"] = format
+        params = LLMProvider._completion_params(
+            provider, model, api_key, prompt, response_format, url, format, temperature
+        )
+        response_cache, cache_key = LLMProvider._get_cache(params, cache)
+        if cache == CacheMode.READ:
+            cached_response = response_cache.get(cache_key)
+            metrics.record_cache_lookup(hit=cached_response is not None)
+            if cached_response is not None:
+                return cached_response
 
+        rate_limiter = get_rate_limiter(provider, rpm, tpm)
+        reserved_tokens = estimate_tokens(prompt)
+        if rate_limiter is not None:
+            rate_limiter.acquire(reserved_tokens)
+
+        started = time.perf_counter()
         response = completion(**params)
-        return response["choices"][0]["message"]["content"]
-    
+        metrics.record_call(time.perf_counter() - started, *_token_usage(response))
+
+        if rate_limiter is not None:
+            rate_limiter.record_usage(reserved_tokens, _total_tokens(response))
+        content = response["choices"][0]["message"]["content"]
+        if response_cache is not None and content is not None:
+            response_cache.set(cache_key, content)
+        return content
+
+    @staticmethod
+    async def acall(
+        provider: str,
+        model: str,
+        api_key: str,
+        prompt: str,
+        response_format: BaseModel | None = None,
+        url: str | None = None,
+        format: str | None = None,
+        temperature: float = 1.0,
+        rpm: int | None = None,
+        tpm: int | None = None,
+        cache: CacheMode = CacheMode.OFF,
+    ) -> str:
+        params = LLMProvider._completion_params(
+            provider, model, api_key, prompt, response_format, url, format, temperature
+        )
+        response_cache, cache_key = LLMProvider._get_cache(params, cache)
+        if cache == CacheMode.READ:
+            cached_response = response_cache.get(cache_key)
+            metrics.record_cache_lookup(hit=cached_response is not None)
+            if cached_response is not None:
+                return cached_response
+
+        rate_limiter = get_rate_limiter(provider, rpm, tpm)
+        reserved_tokens = estimate_tokens(prompt)
+        if rate_limiter is not None:
+            await rate_limiter.acquire_async(reserved_tokens)
+
+        started = time.perf_counter()
+        response = await acompletion(**params)
+        metrics.record_call(time.perf_counter() - started, *_token_usage(response))
+
+        if rate_limiter is not None:
+            rate_limiter.record_usage(reserved_tokens, _total_tokens(response))
+        content = response["choices"][0]["message"]["content"]
+        if response_cache is not None and content is not None:
+            response_cache.set(cache_key, content)
+        return content
+
     @staticmethod
     def embedding(
         provider: str,
@@ -36,7 +108,45 @@ class LLMProvider:
         api_key: str,
         texts: list[str],
         url: str | None = None,
+        rpm: int | None = None,
+        tpm: int | None = None,
+        batch_size: int = 256,
+        max_batch_tokens: int = 100_000,
+        concurrency: int = 4,
+        max_retries: int = 3,
     ) -> list[list[float]]:
+        """
+        Embed `texts` in batches sent concurrently, each retried on its own on
+        transient failures (rate limit, timeout, connection or server error)
+        """
+        batches = _split_embedding_batches(texts, batch_size, max_batch_tokens)
+
+        async def embed_batch(batch: list[str]) -> list[list[float]]:
+            for attempt in range(max_retries + 1):
+                try:
+                    return await LLMProvider.aembedding(
+                        provider, model, api_key, batch, url=url, rpm=rpm, tpm=tpm
+                    )
+                except Exception as e:
+                    if attempt == max_retries or not _is_transient(e):
+                        raise
+                    metrics.record_retry()
+                    await asyncio.sleep(2**attempt)
+
+        embedded_batches = AsyncEngine(concurrency).map(embed_batch, batches)
+        return [vector for batch in embedded_batches for vector in batch]
+
+    @staticmethod
+    async def aembedding(
+        provider: str,
+        model: str,
+        api_key: str,
+        texts: list[str],
+        url: str | None = None,
+        rpm: int | None = None,
+        tpm: int | None = None,
+    ) -> list[list[float]]:
+        rate_limiter = get_rate_limiter(provider, rpm, tpm)
         provider = LLMProvider._resolve_provider(provider)
         params = {
             "model": f"{provider}/{model}",
@@ -44,11 +154,109 @@ class LLMProvider:
             "api_key": api_key,
             "api_base": url,
         }
-        response = embedding(**params)
+        reserved_tokens = sum(estimate_tokens(text) for text in texts)
+        if rate_limiter is not None:
+            await rate_limiter.acquire_async(reserved_tokens)
+
+        started = time.perf_counter()
+        response = await aembedding(**params)
+        metrics.record_call(time.perf_counter() - started, *_token_usage(response))
+
+        if rate_limiter is not None:
+            rate_limiter.record_usage(reserved_tokens, _total_tokens(response))
         return [d["embedding"] for d in response["data"]]
 
+    @staticmethod
+    def _get_cache(
+        params: dict, cache: CacheMode
+    ) -> tuple[ResponseCache | None, str | None]:
+        if cache == CacheMode.OFF:
+            return None, None
+        return get_response_cache(), ResponseCache.make_key(params)
+
+    @staticmethod
+    def _completion_params(
+        provider: str,
+        model: str,
+        api_key: str,
+        prompt: str,
+        response_format: BaseModel | None,
+        url: str | None,
+        format: str | None,
+        temperature: float,
+    ) -> dict:
+        provider = LLMProvider._resolve_provider(provider)
+        params = {
+            "model": f"{provider}/{model}",
+            "messages": [{"content": prompt, "role": "user"}],
+            "api_key": api_key,
+            "api_base": url,
+            "response_format": response_format,
+            "temperature": temperature,
+        }
+        if format:
+            params["format"] = format
+
+        return params
+
     @staticmethod
     def _resolve_provider(provider: str):
         if provider == "ollama":
             return "ollama_chat"
         return provider
+
+
+def _is_transient(error: Exception) -> bool:
+    # Authentication or bad request errors would fail the same way on every retry
+    if isinstance(
+        error,
+        (
+            RateLimitError,
+            Timeout,
+            APIConnectionError,
+            InternalServerError,
+            ServiceUnavailableError,
+        ),
+    ):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return (
+        isinstance(error, APIError)
+        and isinstance(status_code, int)
+        and status_code >= 500
+    )
+
+
+def _total_tokens(response) -> int | None:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None) if usage else None
+
+
+def _token_usage(response) -> tuple[int | None, int | None]:
+    usage = getattr(response, "usage", None)
+    if not usage:
+        return None, None
+    return getattr(usage, "prompt_tokens", None), getattr(
+        usage, "completion_tokens", None
+    )
+
+
+def _split_embedding_batches(
+    texts: list[str], batch_size: int, max_batch_tokens: int
+) -> list[list[str]]:
+    batches, batch, batch_tokens = [], [], 0
+
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if batch and (
+            len(batch) >= batch_size or batch_tokens + tokens > max_batch_tokens
+        ):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(text)
+        batch_tokens += tokens
+
+    if batch:
+        batches.append(batch)
+
+    return batches
@@ -0,0 +1,84 @@
+import statistics
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class MetricsCollector:
+    """
+    Counters of one step execution. LLM calls made while the collector is
+    active are recorded into it.
+    """
+
+    def __init__(self):
+        self.duration = 0.0
+        self.input_nodes = 0
+        self.output_nodes = 0
+        self.llm_calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.retries = 0
+        self.latencies: list[float] = []
+
+    @contextmanager
+    def active(self) -> Iterator["MetricsCollector"]:
+        """
+        Collect the calls made inside the block and add its duration
+        """
+        token = _active_collector.set(self)
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.duration += time.perf_counter() - started
+            _active_collector.reset(token)
+
+    def add_nodes(self, input_nodes: int, output_nodes: int) -> None:
+        self.input_nodes += input_nodes
+        self.output_nodes += output_nodes
+
+    def latency_percentiles(self) -> tuple[float, float, float] | None:
+        """
+        p50, p95 and p99 of the call latencies in seconds
+        """
+        if not self.latencies:
+            return None
+        if len(self.latencies) == 1:
+            return (self.latencies[0],) * 3
+
+        quantiles = statistics.quantiles(self.latencies, n=100, method="inclusive")
+        return quantiles[49], quantiles[94], quantiles[98]
+
+
+# Tasks scheduled by the AsyncEngine copy the context, and the collector with it
+_active_collector: ContextVar[MetricsCollector | None] = ContextVar(
+    "active_collector", default=None
+)
+
+
+def record_call(
+    latency: float, prompt_tokens: int | None, completion_tokens: int | None
+) -> None:
+    if (collector := _active_collector.get()) is None:
+        return
+    collector.llm_calls += 1
+    collector.prompt_tokens += prompt_tokens or 0
+    collector.completion_tokens += completion_tokens or 0
+    collector.latencies.append(latency)
+
+
+def record_cache_lookup(hit: bool) -> None:
+    if (collector := _active_collector.get()) is None:
+        return
+    if hit:
+        collector.cache_hits += 1
+    else:
+        collector.cache_misses += 1
+
+
+def record_retry() -> None:
+    if (collector := _active_collector.get()) is not None:
+        collector.retries += 1
@@ -0,0 +1,136 @@
+import re
+import zlib
+from collections.abc import Callable
+from typing import Literal
+
+import numpy as np
+
+MAX_HASH = np.uint32((1 << 32) - 1)
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# Texts whose shingles are permuted together, small enough to stay in cache
+SIGNATURE_CHUNK_SIZE = 32
+
+
+def shingle_hashes(
+    text: str, kind: Literal["char", "word"], size: int
+) -> np.ndarray:
+    text = text.lower()
+
+    if kind == "word":
+        tokens = WORD_PATTERN.findall(text)
+        shingles = {
+            " ".join(tokens[i : i + size])
+            for i in range(max(1, len(tokens) - size + 1))
+        }
+    else:
+        shingles = {text[i : i + size] for i in range(max(1, len(text) - size + 1))}
+
+    return np.fromiter(
+        (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+
+
+def minhash_signatures(
+    texts: list[str],
+    num_perm: int,
+    kind: Literal["char", "word"] = "word",
+    size: int = 3,
+    seed: int = 1,
+    advance: Callable[[int], None] | None = None,
+) -> np.ndarray:
+    """
+    One row of `num_perm` 32-bit MinHash values per text. Permutations use
+    multiply-shift hashing, the high bits of `a * hash + b` modulo 2^64.
+    """
+    generator = np.random.default_rng(seed)
+    max_value = np.iinfo(np.uint64).max
+    a = generator.integers(1, max_value, size=num_perm, dtype=np.uint64) | 1
+    b = generator.integers(0, max_value, size=num_perm, dtype=np.uint64)
+
+    signatures = np.full((len(texts), num_perm), MAX_HASH, dtype=np.uint32)
+    for start in range(0, len(texts), SIGNATURE_CHUNK_SIZE):
+        chunk = [
+            shingle_hashes(text, kind, size)
+            for text in texts[start : start + SIGNATURE_CHUNK_SIZE]
+        ]
+        lengths = np.fromiter((len(hashes) for hashes in chunk), dtype=np.intp)
+        non_empty = np.flatnonzero(lengths)
+
+        if len(non_empty) > 0:
+            hashes = np.concatenate(chunk)
+            permuted = ((np.outer(hashes, a) + b) >> 32).astype(np.uint32)
+            offsets = np.r_[0, np.cumsum(lengths)[:-1]][non_empty]
+            signatures[start + non_empty] = np.minimum.reduceat(permuted, offsets)
+
+        if advance is not None:
+            advance(len(chunk))
+
+    return signatures
+
+
+def lsh_deduplicate(
+    signatures: np.ndarray,
+    bands: int,
+    rows: int,
+    threshold: float,
+    keep: Literal["first", "last"] = "first",
+) -> np.ndarray:
+    """
+    Indices kept by a greedy pass over LSH candidates: walking texts in order
+    (reversed for `keep: last`), each kept text discards the remaining texts
+    sharing a band bucket with an estimated Jaccard similarity >= `threshold`.
+    """
+    count = len(signatures)
+    bucket_members = _band_buckets(signatures, bands, rows)
+    order = range(count) if keep == "first" else range(count - 1, -1, -1)
+    keep_mask = np.ones(count, dtype=bool)
+
+    for index in order:
+        if not keep_mask[index] or index not in bucket_members:
+            continue
+
+        candidates = np.unique(np.concatenate(bucket_members[index]))
+        candidates = candidates[
+            keep_mask[candidates]
+            & ((candidates > index) if keep == "first" else (candidates < index))
+        ]
+        if len(candidates) == 0:
+            continue
+
+        similarities = (signatures[candidates] == signatures[index]).mean(axis=1)
+        keep_mask[candidates[similarities >= threshold]] = False
+
+    return np.flatnonzero(keep_mask)
+
+
+def _band_buckets(
+    signatures: np.ndarray, bands: int, rows: int
+) -> dict[int, list[np.ndarray]]:
+    """
+    Members of every non-singleton band bucket, indexed by text
+    """
+    bucket_members: dict[int, list[np.ndarray]] = {}
+
+    for band in range(bands):
+        band_values = np.ascontiguousarray(
+            signatures[:, band * rows : (band + 1) * rows]
+        ).view(np.dtype((np.void, rows * signatures.dtype.itemsize)))
+        _, bucket_ids, bucket_sizes = np.unique(
+            band_values.ravel(), return_inverse=True, return_counts=True
+        )
+
+        shared = np.flatnonzero(bucket_sizes[bucket_ids] > 1)
+        if len(shared) == 0:
+            continue
+
+        shared = shared[np.argsort(bucket_ids[shared], kind="stable")]
+        boundaries = np.flatnonzero(np.diff(bucket_ids[shared])) + 1
+        for members in np.split(shared, boundaries):
+            for member in members:
+                bucket_members.setdefault(int(member), []).append(members)
+
+    return bucket_members
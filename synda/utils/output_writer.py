@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+from synda.model.node import Node
+from synda.utils.dependencies import import_optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from synda.config.output import OutputConfig
+
+
+class OutputWriter(ABC):
+    """
+    Append nodes to a `.partial` file next to the output, renamed over the
+    output on commit. A failed run leaves the partial file behind.
+    """
+
+    typed: bool = False
+
+    def __init__(self, config: OutputConfig):
+        self.config = config
+        self.partial_path = config.path.with_name(f"{config.path.name}.partial")
+
+    def __enter__(self) -> OutputWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None:
+            self.close()
+
+    def write(self, nodes: list[Node]) -> None:
+        self.write_columns(self.config.select_columns(nodes, typed=self.typed))
+
+    @abstractmethod
+    def write_columns(self, columns: dict[str, list]) -> None: ...
+
+    @abstractmethod
+    def close(self) -> None: ...
+
+    def commit(self) -> None:
+        self.close()
+        os.replace(self.partial_path, self.config.path)
+
+
+class CSVOutputWriter(OutputWriter):
+    def __init__(self, config: OutputConfig):
+        super().__init__(config)
+        self._file = self.partial_path.open("w", encoding="utf-8", newline="")
+        self._header_written = False
+
+    def write_columns(self, columns: dict[str, list]) -> None:
+        _to_text_dataframe(columns).to_csv(
+            self._file,
+            sep=self.config.separator,
+            index=False,
+            header=not self._header_written,
+        )
+        self._header_written = True
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        if not self._header_written:
+            self.write_columns(_empty_columns(self.config))
+        self._file.close()
+
+
+class JSONLOutputWriter(OutputWriter):
+    typed = True
+
+    def __init__(self, config: OutputConfig):
+        super().__init__(config)
+        self._file = self.partial_path.open("w", encoding="utf-8")
+
+    def write_columns(self, columns: dict[str, list]) -> None:
+        self._file.writelines(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n"
+            for row in zip(*columns.values())
+        )
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class XLSOutputWriter(OutputWriter):
+    def __init__(self, config: OutputConfig):
+        super().__init__(config)
+        import openpyxl
+
+        # Write-only workbooks stream their rows to a temporary file
+        self._workbook = openpyxl.Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet(config.sheet_name)
+        self._sheet.append(list(_empty_columns(config)))
+        self._closed = False
+
+    def write_columns(self, columns: dict[str, list]) -> None:
+        for row in zip(*_to_text_columns(columns).values()):
+            self._sheet.append(list(row))
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._workbook.save(self.partial_path)
+        self._closed = True
+
+
+class ParquetOutputWriter(OutputWriter):
+    """
+    Rows are buffered into row groups of `row_group_size`. The schema is set
+    by the first row group. When a later row group brings new metadata keys,
+    the row groups already written are rewritten with the widened type, or
+    with JSON strings when the types of a key conflict.
+    """
+
+    typed = True
+
+    def __init__(self, config: OutputConfig):
+        super().__init__(config)
+        self._pa = import_optional("pyarrow", "parquet", "Parquet output")
+        self._parquet = import_optional("pyarrow.parquet", "parquet", "Parquet output")
+        self._writer = None
+        self._buffer: dict[str, list] = {}
+        self._buffered_rows = 0
+        self._closed = False
+
+    def write_columns(self, columns: dict[str, list]) -> None:
+        for name, values in columns.items():
+            self._buffer.setdefault(name, []).extend(values)
+        self._buffered_rows += len(next(iter(columns.values()), []))
+
+        if self._buffered_rows >= self.config.row_group_size:
+            self._write_row_group()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        if self._buffered_rows or self._writer is None:
+            self._write_row_group()
+        self._writer.close()
+        self._closed = True
+
+    def _write_row_group(self) -> None:
+        columns = self._buffer or _empty_columns(self.config)
+        self._buffer, self._buffered_rows = {}, 0
+
+        if self._writer is None:
+            table = _to_arrow_table(columns)
+            self._writer = self._parquet.ParquetWriter(self.partial_path, table.schema)
+        else:
+            table = self._to_schema(columns)
+
+        self._writer.write_table(table, row_group_size=self.config.row_group_size)
+
+    def _to_schema(self, columns: dict[str, list]):
+        pa = self._pa
+        schema = self._writer.schema
+        arrays = {}
+
+        for name, values in columns.items():
+            field_type = schema.field(name).type
+            if name != "metadata":
+                arrays[name] = pa.array(values, type=field_type)
+            elif pa.types.is_string(field_type):
+                arrays[name] = pa.array([json.dumps(v) for v in values])
+            elif (array := _typed_metadata(pa, values, field_type)) is not None:
+                arrays[name] = array
+            else:
+                self._rewrite_metadata(
+                    _widen_metadata_type(pa, field_type, values) or pa.string()
+                )
+                return self._to_schema(columns)
+
+        return pa.table(arrays, schema=self._writer.schema)
+
+    def _rewrite_metadata(self, metadata_type) -> None:
+        """
+        Copy the row groups written so far with a new metadata column type
+        """
+        pa, parquet = self._pa, self._parquet
+        self._writer.close()
+
+        written_path = self.partial_path.with_name(f"{self.partial_path.name}.typed")
+        os.replace(self.partial_path, written_path)
+        written_file = parquet.ParquetFile(written_path)
+
+        schema = written_file.schema_arrow
+        schema = schema.set(
+            schema.get_field_index("metadata"), pa.field("metadata", metadata_type)
+        )
+        self._writer = parquet.ParquetWriter(self.partial_path, schema)
+
+        for index in range(written_file.num_row_groups):
+            table = written_file.read_row_group(index)
+            metadata = table.column("metadata")
+            if pa.types.is_string(metadata_type):
+                metadata = pa.array([json.dumps(v) for v in metadata.to_pylist()])
+            else:
+                metadata = metadata.cast(metadata_type)
+            table = table.set_column(
+                table.schema.get_field_index("metadata"), "metadata", metadata
+            )
+            self._writer.write_table(table)
+
+        written_path.unlink()
+
+
+AVAILABLE_COLUMNS = ("value", "ablated", "metadata")
+
+
+def _empty_columns(config: OutputConfig) -> dict[str, list]:
+    return {column: [] for column in config.columns if column in AVAILABLE_COLUMNS}
+
+
+def _to_text_columns(columns: dict[str, list]) -> dict[str, list]:
+    """
+    Text formats get the metadata as JSON rather than a Python repr
+    """
+    if "metadata" not in columns:
+        return columns
+
+    return columns | {
+        "metadata": [
+            json.dumps(metadata, ensure_ascii=False) for metadata in columns["metadata"]
+        ]
+    }
+
+
+def _to_text_dataframe(columns: dict[str, list]) -> pd.DataFrame:
+    import pandas as pd
+
+    return pd.DataFrame(_to_text_columns(columns))
+
+
+def _to_arrow_table(columns: dict[str, list]):
+    """
+    Metadata is stored as a typed list of structs, or as JSON strings when
+    its entries do not share one type per key
+    """
+    pa = import_optional("pyarrow", "parquet", "Parquet output")
+    arrays = {}
+
+    for name, values in columns.items():
+        if name == "metadata":
+            try:
+                arrays[name] = pa.array(values)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                arrays[name] = pa.array([json.dumps(v) for v in values])
+        else:
+            arrays[name] = pa.array(values)
+
+    return pa.table(arrays)
+
+
+def _typed_metadata(pa, values: list[list[dict]], field_type):
+    """
+    `values` as a `field_type` array, None when some of their keys or types
+    would not survive the conversion
+    """
+    value_type = field_type.value_type
+    fields = (
+        {field.name for field in value_type} if pa.types.is_struct(value_type) else set()
+    )
+    if any(key not in fields for entries in values for entry in entries for key in entry):
+        return None
+
+    try:
+        return pa.array(values, type=field_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+
+
+def _widen_metadata_type(pa, field_type, values: list[list[dict]]):
+    """
+    Type holding both `field_type` and `values`, None when they conflict
+    """
+    try:
+        schemas = [
+            pa.schema([("metadata", field_type)]),
+            pa.schema([("metadata", pa.array(values).type)]),
+        ]
+        return pa.unify_schemas(schemas, promote_options="permissive").field(
+            "metadata"
+        ).type
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
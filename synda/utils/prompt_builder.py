@@ -1,119 +1,230 @@
 import random
 import re
+from collections import OrderedDict
+from collections.abc import Iterable
 from enum import Enum
 from itertools import product
 
-from sqlmodel import Session
+from sqlmodel import Session, select
 
 from synda.model.node import Node
+from synda.model.utils import MAX_QUERY_PARAMETERS
+from synda.utils.iterables import batched
+
+ANCESTOR_CACHE_SIZE = 100_000
 
 
 class SpecialVariable(Enum):
     INSTRUCTIONS = "instructions"
 
 
+_special_vars = "|".join(var.value for var in SpecialVariable)
+SPECIAL_VARIABLES_PATTERN = re.compile(rf"{{({_special_vars})}}")
+TEMPLATE_VARIABLES_PATTERN = re.compile(rf"{{(?!{_special_vars})([^}}]+)}}")
+
+
+class AncestorCache:
+    """
+    LRU cache of node values, shared across steps, keyed by database and node id
+    """
+
+    def __init__(self, max_size: int = ANCESTOR_CACHE_SIZE):
+        self.max_size = max_size
+        self._values: OrderedDict[tuple[str, int], str] = OrderedDict()
+
+    def get_values(self, session: Session, node_ids: Iterable[int]) -> dict[int, str]:
+        database = str(session.get_bind().url)
+        values, missing_ids = {}, []
+
+        for node_id in dict.fromkeys(node_ids):
+            key = (database, node_id)
+            if key in self._values:
+                self._values.move_to_end(key)
+                values[node_id] = self._values[key]
+            else:
+                missing_ids.append(node_id)
+
+        for ids in batched(missing_ids, MAX_QUERY_PARAMETERS):
+            rows = session.exec(
+                select(Node.id, Node.value).where(Node.id.in_(ids))  # noqa
+            ).all()
+            for node_id, value in rows:
+                values[node_id] = value
+                self._store((database, node_id), value)
+
+        return values
+
+    def clear(self) -> None:
+        self._values.clear()
+
+    def _store(self, key: tuple[str, int], value: str) -> None:
+        self._values[key] = value
+        if len(self._values) > self.max_size:
+            self._values.popitem(last=False)
+
+
+ancestor_cache = AncestorCache()
+
+
+class CompiledTemplate:
+    """
+    Template parsed once per step, then only substituted for each node
+    """
+
+    def __init__(
+        self,
+        template: str,
+        instruction_sets: dict[str, list[str]] | None = None,
+        instruction_mode: str = "random",
+    ):
+        self.template = template
+        self.instruction_sets = instruction_sets
+        self.instruction_mode = instruction_mode
+        self.special_variables = PromptBuilder._extract_special_variables(template)
+        self._template_variables: dict[str, list[str]] = {}
+        self._expanded_prompts: list[str] | None = None
+        self.is_constant = (
+            len(self.special_variables) == 0
+            and len(self.template_variables(template)) == 0
+        )
+
+    def expand(self) -> list[str]:
+        """
+        Substitute the special variables, drawing new random instructions per call
+        """
+        if len(self.special_variables) == 0:
+            return [self.template]
+
+        if self.instruction_mode != "random":
+            if self._expanded_prompts is None:
+                self._expanded_prompts = self._format_special_variables()
+            return self._expanded_prompts
+
+        return self._format_special_variables()
+
+    def template_variables(self, prompt: str) -> list[str]:
+        if prompt not in self._template_variables:
+            self._template_variables[prompt] = (
+                PromptBuilder._extract_template_variables(prompt)
+            )
+        return self._template_variables[prompt]
+
+    def _format_special_variables(self) -> list[str]:
+        prompts_with_special_variables = []
+        instructions_list = PromptBuilder._build_instructions(
+            self.instruction_sets, self.instruction_mode
+        )
+
+        for instructions in instructions_list:
+            variable_value = {}
+            for variable_name in self.special_variables:
+                if variable_name == SpecialVariable.INSTRUCTIONS.value:
+                    variable_value[SpecialVariable.INSTRUCTIONS.value] = instructions
+
+            formatted_prompt = self.template.format(**variable_value)
+            prompts_with_special_variables.append(formatted_prompt)
+
+        return prompts_with_special_variables
+
+
 class PromptBuilder:
     # @todo send multiple template at once: template: str | list[str
-    # @todo send a single node at once: input_data: list[Node] | Node
+    @staticmethod
+    def compile(
+        template: str,
+        instruction_sets: dict[str, list[str]] | None = None,
+        instruction_mode: str = "random",
+    ) -> CompiledTemplate:
+        return CompiledTemplate(template, instruction_sets, instruction_mode)
+
     @staticmethod
     def build(
         session: Session,
-        template: str,
+        template: str | CompiledTemplate,
         input_data: list[Node],
         instruction_sets: dict[str, list[str]] | None = None,
         instruction_mode: str = "random"
     ) -> list[str]:
-        prompts_with_special_variables = (
-            PromptBuilder._build_prompts_with_special_variables(
-                template, input_data, instruction_sets, instruction_mode
-            )
-        )
-        prompts_with_template_variables = (
-            PromptBuilder._build_prompts_with_template_variables(
-                session, prompts_with_special_variables, input_data
+        return [
+            prompt
+            for node_prompts in PromptBuilder.build_batch(
+                session, template, input_data, instruction_sets, instruction_mode
             )
-        )
-        return prompts_with_template_variables
+            for prompt in node_prompts
+        ]
 
     @staticmethod
-    def _build_prompts_with_special_variables(
-        template: str,
+    def build_batch(
+        session: Session,
+        template: str | CompiledTemplate,
         input_data: list[Node],
-        instruction_sets: dict[str, list[str]] | None,
-        instruction_mode: str
-    ) -> list[str]:
-        special_variables = PromptBuilder._extract_special_variables(template)
-
-        if len(special_variables) == 0:
-            return [template for _ in input_data]
-
-        prompts_with_special_variables = []
-
-        for _ in input_data:
-            instructions_list = PromptBuilder._build_instructions(instruction_sets, instruction_mode)
-            
-            for instructions in instructions_list:
-                variable_value = {}
-                for variable_name in special_variables:
-                    if variable_name == SpecialVariable.INSTRUCTIONS.value:
-                        variable_value[SpecialVariable.INSTRUCTIONS.value] = instructions
+        instruction_sets: dict[str, list[str]] | None = None,
+        instruction_mode: str = "random"
+    ) -> list[list[str]]:
+        """
+        Build the prompts of every node at once, returned in the nodes order
+        """
+        if isinstance(template, str):
+            template = PromptBuilder.compile(
+                template, instruction_sets, instruction_mode
+            )
 
-                formatted_prompt = template.format(**variable_value)
-                prompts_with_special_variables.append(formatted_prompt)
+        if template.is_constant:
+            return [[template.template] for _ in input_data]
 
-        return prompts_with_special_variables
+        prompts_with_special_variables = [template.expand() for _ in input_data]
+        return PromptBuilder._build_prompts_with_template_variables(
+            session, template, prompts_with_special_variables, input_data
+        )
 
     @staticmethod
     def _build_prompts_with_template_variables(
         session: Session,
-        prompts_with_special_variables: list[str],
+        template: CompiledTemplate,
+        prompts_with_special_variables: list[list[str]],
         input_data: list[Node],
-    ) -> list[str]:
+    ) -> list[list[str]]:
+        template_variables = [
+            [template.template_variables(prompt) for prompt in prompts]
+            for prompts in prompts_with_special_variables
+        ]
+        ancestor_values = PromptBuilder._get_ancestor_values(
+            session, template_variables, input_data
+        )
+
         prompts_with_template_variables = []
-        
-        for prompt in prompts_with_special_variables:
-            template_variables = PromptBuilder._extract_template_variables(prompt)
-            
-            if len(template_variables) == 0:
-                prompts_with_template_variables.append(prompt)
-                continue
-                
-            for node in input_data:
+
+        for node, prompts, prompts_variables in zip(
+            input_data, prompts_with_special_variables, template_variables
+        ):
+            node_prompts = []
+            for prompt, variables in zip(prompts, prompts_variables):
+                if len(variables) == 0:
+                    node_prompts.append(prompt)
+                    continue
+
                 variable_value = {}
-                for variable_name in template_variables:
+                for variable_name in variables:
                     if variable_name not in node.ancestors:
                         continue
                     parent_node_id = node.ancestors[variable_name]
-                    parent_node = Node.get(session, parent_node_id)
-                    variable_value[variable_name] = parent_node.value
+                    variable_value[variable_name] = ancestor_values[parent_node_id]
 
-                formatted_prompt = prompt.format(**variable_value)
-                prompts_with_template_variables.append(formatted_prompt)
+                node_prompts.append(prompt.format(**variable_value))
+            prompts_with_template_variables.append(node_prompts)
 
         return prompts_with_template_variables
 
     @staticmethod
     def _extract_special_variables(template: str) -> list[str]:
-        pattern = PromptBuilder._pattern_only_special_variables()
-        matches = re.finditer(pattern, template)
+        matches = SPECIAL_VARIABLES_PATTERN.finditer(template)
         return [match.group(1) for match in matches]
 
     @staticmethod
     def _extract_template_variables(template: str) -> list[str]:
-        pattern = PromptBuilder._pattern_without_special_variables()
-        matches = re.finditer(pattern, template)
+        matches = TEMPLATE_VARIABLES_PATTERN.finditer(template)
         return [match.group(1) for match in matches]
 
-    @staticmethod
-    def _pattern_only_special_variables() -> str:
-        special_vars = "|".join(var.value for var in SpecialVariable)
-        return rf"{{({special_vars})}}"
-
-    @staticmethod
-    def _pattern_without_special_variables() -> str:
-        special_vars = "|".join(var.value for var in SpecialVariable)
-        return rf"{{(?!{special_vars})([^}}]+)}}"
-
     @staticmethod
     def _build_instructions(instruction_sets: dict[str, list[str]] | None, mode: str = "random") -> list[str]:
         if instruction_sets is None:
@@ -135,13 +246,21 @@ class PromptBuilder:
             raise ValueError(f"Unknown instruction mode: {mode}")
 
     @staticmethod
-    def _get_parent_nodes(
-        session: Session, variables: set[str], input_data: list[Node]
-    ) -> list[Node]:
-        parent_node_ids = set()
+    def _get_ancestor_values(
+        session: Session,
+        template_variables: list[list[list[str]]],
+        input_data: list[Node],
+    ) -> dict[int, str]:
+        ancestor_ids = []
+
+        for node, prompts_variables in zip(input_data, template_variables):
+            for variables in prompts_variables:
+                for variable_name in variables:
+                    if variable_name in node.ancestors:
+                        ancestor_ids.append(node.ancestors[variable_name])
+
+        if not ancestor_ids:
+            return {}
 
-        for node in input_data:
-            for variable_name in variables:
-                parent_node_ids.add(node.ancestors[variable_name])
+        return ancestor_cache.get_values(session, ancestor_ids)
 
-        return Node.get(session, list(parent_node_ids))
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Bucket refilled continuously up to `rate_per_minute`. It can go into debt
+    when actual usage turns out higher than what was reserved.
+    """
+
+    def __init__(self, rate_per_minute: int):
+        self.capacity = float(rate_per_minute)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def wait_time(self, amount: float) -> float:
+        """
+        Seconds to wait before `amount` is available
+        """
+        self._refill()
+        amount = min(amount, self.capacity)
+
+        if self.tokens >= amount:
+            return 0.0
+
+        return (amount - self.tokens) * 60 / self.capacity
+
+    def consume(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, amount: float) -> None:
+        self.tokens = min(self.tokens - amount, self.capacity)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated_at) * self.capacity / 60,
+        )
+        self.updated_at = now
+
+
+class RateLimiter:
+    def __init__(self, rpm: int | None = None, tpm: int | None = None):
+        self._lock = threading.Lock()
+        self.rpm = rpm
+        self.tpm = tpm
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+
+    def acquire(self, tokens: int) -> None:
+        while (wait := self._reserve(tokens)) > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int) -> None:
+        while (wait := self._reserve(tokens)) > 0:
+            await asyncio.sleep(wait)
+
+    def record_usage(self, reserved_tokens: int, used_tokens: int | None) -> None:
+        if self.tokens is None or used_tokens is None:
+            return
+        with self._lock:
+            self.tokens.adjust(used_tokens - reserved_tokens)
+
+    def _reserve(self, tokens: int) -> float:
+        reservations = [
+            (bucket, amount)
+            for bucket, amount in ((self.requests, 1), (self.tokens, tokens))
+            if bucket is not None
+        ]
+
+        with self._lock:
+            wait = max(bucket.wait_time(amount) for bucket, amount in reservations)
+            if wait > 0:
+                return wait
+
+            for bucket, amount in reservations:
+                bucket.consume(amount)
+            return 0.0
+
+
+_rate_limiters: dict[tuple[str, int | None, int | None], RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    provider: str, rpm: int | None, tpm: int | None
+) -> RateLimiter | None:
+    """
+    Limiter shared by every call to `provider` with the same limits within
+    the process, steps overriding them get their own buckets
+    """
+    if not rpm and not tpm:
+        return None
+
+    with _rate_limiters_lock:
+        key = (provider, rpm, tpm)
+        if key not in _rate_limiters:
+            _rate_limiters[key] = RateLimiter(rpm=rpm, tpm=tpm)
+        return _rate_limiters[key]
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English text with common tokenizers
+    return len(text) // 4 + 1
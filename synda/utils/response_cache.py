@@ -0,0 +1,146 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from enum import StrEnum
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from synda.utils.env import get_cache_max_size_mb, get_cache_ttl_days
+
+# Eviction only runs every few writes, a full table scan is not free
+PRUNE_EVERY_WRITES = 500
+
+
+class CacheMode(StrEnum):
+    READ = "read"  # answer from the cache, store the misses
+    WRITE = "write"  # always call the provider, refresh the cache
+    OFF = "off"
+
+
+class ResponseCache:
+    """
+    On-disk cache of LLM responses with TTL and total size (LRU) eviction
+    """
+
+    def __init__(self, path: Path, max_size: int, ttl: float | None = None):
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS response ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_response_accessed_at "
+            "ON response (accessed_at)"
+        )
+        self.prune()
+
+    @staticmethod
+    def make_key(params: dict) -> str:
+        response_format = params.get("response_format")
+        if isinstance(response_format, type) and issubclass(response_format, BaseModel):
+            response_format = response_format.model_json_schema()
+
+        keyed_params = {
+            # A local proxy and the hosted API may serve the same model name
+            "api_base": params.get("api_base"),
+            "model": params.get("model"),
+            "messages": params.get("messages"),
+            "input": params.get("input"),
+            "temperature": params.get("temperature"),
+            "response_format": response_format,
+            "format": params.get("format"),
+        }
+        payload = json.dumps(keyed_params, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, created_at FROM response WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+                self.misses += 1
+                return None
+
+            self._connection.execute(
+                "UPDATE response SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._connection.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO response VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value.encode("utf-8")), now, now),
+            )
+            self._connection.commit()
+            self._writes += 1
+
+        if self._writes % PRUNE_EVERY_WRITES == 0:
+            self.prune()
+
+    def prune(self) -> None:
+        with self._lock:
+            if self.ttl is not None:
+                self._connection.execute(
+                    "DELETE FROM response WHERE created_at < ?",
+                    (time.time() - self.ttl,),
+                )
+
+            total_size = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM response"
+            ).fetchone()[0]
+            if total_size > self.max_size:
+                self._evict_least_recently_used(total_size - self.max_size)
+
+            self._connection.commit()
+
+    def _evict_least_recently_used(self, excess_size: int) -> None:
+        evicted_keys, evicted_size = [], 0
+        rows = self._connection.execute(
+            "SELECT key, size FROM response ORDER BY accessed_at"
+        )
+
+        for key, size in rows:
+            if evicted_size >= excess_size:
+                break
+            evicted_keys.append((key,))
+            evicted_size += size
+
+        self._connection.executemany("DELETE FROM response WHERE key = ?", evicted_keys)
+
+
+_response_cache: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        from synda.database import get_synda_dir
+
+        ttl_days = get_cache_ttl_days()
+        _response_cache = ResponseCache(
+            path=get_synda_dir() / "llm_cache.db",
+            max_size=get_cache_max_size_mb() * 1024 * 1024,
+            ttl=ttl_days * 24 * 3600 if ttl_days is not None else None,
+        )
+    return _response_cache
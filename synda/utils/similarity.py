@@ -0,0 +1,107 @@
+from collections.abc import Callable
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.preprocessing import normalize
+
+
+def greedy_cosine_deduplicate(
+    vectors: np.ndarray,
+    threshold: float,
+    max_memory_mb: int = 256,
+    advance: Callable[[int], None] | None = None,
+) -> np.ndarray:
+    """
+    Indices kept by a greedy keep-first pass: walking rows in order, each kept
+    row discards every later row whose cosine similarity exceeds `threshold`.
+
+    Similarities are computed in row tiles sized to `max_memory_mb`, so the
+    N x N matrix is never materialized.
+    """
+    count = len(vectors)
+    if count == 0:
+        return np.empty(0, dtype=np.intp)
+
+    vectors = np.asarray(vectors)
+    if not np.issubdtype(vectors.dtype, np.floating):
+        vectors = vectors.astype(np.float64)
+    vectors = normalize(vectors)
+
+    # Each tile holds a similarity row and a boolean mask row per column
+    row_bytes = count * (vectors.dtype.itemsize + 1)
+    tile_size = max(1, (max_memory_mb * 1024 * 1024) // row_bytes)
+    keep = np.ones(count, dtype=bool)
+
+    for start in range(0, count, tile_size):
+        end = min(start + tile_size, count)
+        similarities = vectors[start:end] @ vectors[start:].T
+        # Only pairs (i, j) with j > i matter for the greedy pass
+        duplicates = np.triu(similarities > threshold, k=1)
+        del similarities
+
+        rows, columns = np.nonzero(duplicates)
+        _discard_later_duplicates(keep, start + rows, start + columns)
+
+        if advance is not None:
+            advance(end - start)
+
+    return np.flatnonzero(keep)
+
+
+def greedy_sparse_deduplicate(
+    matrix: csr_matrix,
+    threshold: float,
+    keep: str = "first",
+    block_size: int = 1024,
+    advance: Callable[[int], None] | None = None,
+) -> np.ndarray:
+    """
+    Indices kept after comparing the L2-normalized sparse rows of `matrix`.
+    With `keep: first` each kept row discards every later row whose cosine
+    similarity exceeds `threshold`, with `keep: last` a row is discarded as
+    soon as any later row exceeds it.
+
+    Similarities are computed as sparse products per block of rows and only
+    the pairs above `threshold` are retained.
+    """
+    count = matrix.shape[0]
+    matrix = csr_matrix(matrix)
+    keep_mask = np.ones(count, dtype=bool)
+
+    for start in range(0, count, block_size):
+        end = min(start + block_size, count)
+        similarities = (matrix[start:end] @ matrix[start:].T).tocsr()
+
+        rows = start + np.repeat(
+            np.arange(end - start), np.diff(similarities.indptr)
+        )
+        columns = start + similarities.indices
+        above = (similarities.data > threshold) & (columns > rows)
+        rows, columns = rows[above], columns[above]
+        del similarities
+
+        if keep == "first":
+            _discard_later_duplicates(keep_mask, rows, columns)
+        else:
+            keep_mask[rows] = False
+
+        if advance is not None:
+            advance(end - start)
+
+    return np.flatnonzero(keep_mask)
+
+
+def _discard_later_duplicates(
+    keep: np.ndarray, rows: np.ndarray, columns: np.ndarray
+) -> None:
+    """
+    Walk the (row, column) duplicate pairs grouped by increasing row, each
+    still kept row discarding its columns
+    """
+    if len(rows) == 0:
+        return
+
+    row_starts = np.r_[0, np.flatnonzero(np.diff(rows)) + 1]
+    for row, row_columns in zip(rows[row_starts], np.split(columns, row_starts[1:])):
+        if keep[row]:
+            keep[row_columns] = False
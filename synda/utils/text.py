@@ -0,0 +1,51 @@
+import hashlib
+import re
+import unicodedata
+from enum import StrEnum
+from functools import lru_cache
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class Normalization(StrEnum):
+    CASE = "case"  # case-insensitive comparison
+    WHITESPACE = "whitespace"  # collapse whitespace runs, strip both ends
+    UNICODE = "unicode"  # NFKC, compatibility characters folded
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def normalize_text(text: str, normalizations: list[Normalization]) -> str:
+    if Normalization.UNICODE in normalizations:
+        text = unicodedata.normalize("NFKC", text)
+    if Normalization.WHITESPACE in normalizations:
+        text = WHITESPACE_PATTERN.sub(" ", text).strip()
+    if Normalization.CASE in normalizations:
+        text = text.casefold()
+
+    return text
+
+
+@lru_cache(maxsize=None)
+def _fold_char(char: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", char)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def fold_text(text: str) -> tuple[str, list[int] | None]:
+    """
+    Case and accent folded `text`, with the offset in `text` of every folded
+    character (None when both strings share their offsets)
+    """
+    if text.isascii():
+        return text.lower(), None
+
+    folded, offsets = [], []
+    for offset, char in enumerate(text):
+        folded_char = _fold_char(char)
+        folded.append(folded_char)
+        offsets.extend([offset] * len(folded_char))
+
+    return "".join(folded), offsets
@@ -0,0 +1,38 @@
+import importlib.util
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import tiktoken
+
+
+@lru_cache
+def get_encoding(name: str) -> tiktoken.Encoding:
+    """
+    Local tiktoken encoding: litellm ships the encoding files, pointing
+    TIKTOKEN_CACHE_DIR at them means nothing is downloaded
+    """
+    if (tokenizers_dir := _litellm_tokenizers_dir()) is not None:
+        os.environ.setdefault("TIKTOKEN_CACHE_DIR", str(tokenizers_dir))
+
+    return tiktoken.get_encoding(name)
+
+
+def _litellm_tokenizers_dir() -> Path | None:
+    # Located without importing litellm, which takes seconds
+    spec = importlib.util.find_spec("litellm")
+    if spec is None or not spec.submodule_search_locations:
+        return None
+
+    return Path(spec.submodule_search_locations[0]) / "litellm_core_utils" / "tokenizers"
+
+
+def token_offsets(text: str, encoding_name: str) -> list[int]:
+    """
+    Character offset at which each token of `text` starts
+    """
+    encoding = get_encoding(encoding_name)
+    tokens = encoding.encode(text, disallowed_special=())
+    _, offsets = encoding.decode_with_offsets(tokens)
+
+    return offsets
@@ -0,0 +1,55 @@
+import json
+import os
+import subprocess
+import sys
+
+# Seconds, a few times what importing the CLI takes without the heavy
+# dependencies. Importing litellm alone takes longer.
+IMPORT_TIME_BUDGET = 1.0
+
+HEAVY_MODULES = ["litellm", "pandas", "sklearn", "PyPDF2", "openpyxl", "pyarrow"]
+
+
+def _run_python(code: str, home, *args: str, check: bool = True) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code, *args],
+        capture_output=True,
+        text=True,
+        check=check,
+        env={**os.environ, "HOME": str(home)},
+    )
+    return result.stdout
+
+
+def test_cli_import_skips_heavy_dependencies(tmp_path):
+    output = _run_python(
+        "import json, sys, time\n"
+        "started = time.perf_counter()\n"
+        "import synda.cli.app\n"
+        "elapsed = time.perf_counter() - started\n"
+        f"loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'elapsed': elapsed, 'loaded': loaded}))\n",
+        tmp_path,
+    )
+    report = json.loads(output)
+
+    assert report["loaded"] == []
+    assert report["elapsed"] < IMPORT_TIME_BUDGET
+
+
+def test_cli_import_has_no_side_effects(tmp_path):
+    _run_python("import synda.cli.app", tmp_path)
+
+    assert not (tmp_path / ".synda").exists()
+
+
+def test_help_does_not_create_the_database(tmp_path):
+    _run_python(
+        "from synda.cli import main; main()",
+        tmp_path,
+        "provider",
+        "--help",
+        check=False,
+    )
+
+    assert not (tmp_path / ".synda").exists()
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from synda.utils.similarity import greedy_cosine_deduplicate, greedy_sparse_deduplicate
+
+
+def _naive_deduplicate(similarities: np.ndarray, threshold: float, keep: str):
+    """
+    Pairwise greedy pass the blocked implementations must reproduce
+    """
+    kept = set(range(len(similarities)))
+    for index in range(len(similarities)):
+        if index not in kept:
+            continue
+        for compared_index in range(index + 1, len(similarities)):
+            if compared_index not in kept:
+                continue
+            if similarities[index, compared_index] > threshold:
+                if keep == "first":
+                    kept.discard(compared_index)
+                else:
+                    kept.discard(index)
+                    break
+
+    return sorted(kept)
+
+
+def _clustered_vectors(count: int, dimensions: int, seed: int = 0) -> np.ndarray:
+    # Few dimensions and noisy copies of a few centers give chains of
+    # near-duplicates, where the order of the greedy pass matters
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(count // 20, dimensions))
+    vectors = centers[rng.integers(len(centers), size=count)]
+    return (vectors + rng.normal(scale=0.3, size=vectors.shape)).astype(np.float32)
+
+
+@pytest.mark.parametrize("max_memory_mb", [0, 1, 256])
+def test_greedy_cosine_deduplicate_matches_pairwise_pass(max_memory_mb):
+    # 1200 float32 rows: one row per tile, 174 row tiles or a single tile
+    vectors = _clustered_vectors(1200, 8)
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = _naive_deduplicate(normalized @ normalized.T, 0.9, "first")
+
+    kept = greedy_cosine_deduplicate(vectors, 0.9, max_memory_mb=max_memory_mb)
+
+    assert 0 < len(expected) < len(vectors)
+    assert kept.tolist() == expected
+
+
+def test_greedy_cosine_deduplicate_reports_every_row():
+    advanced = []
+
+    greedy_cosine_deduplicate(
+        _clustered_vectors(1200, 8), 0.9, max_memory_mb=1, advance=advanced.append
+    )
+
+    assert sum(advanced) == 1200
+    assert len(advanced) > 1
+
+
+def _tfidf_matrix(count: int, seed: int = 0):
+    # Short texts over a tiny vocabulary share most of their words
+    rng = np.random.default_rng(seed)
+    vocabulary = [f"word{index}" for index in range(12)]
+    texts = [
+        " ".join(rng.choice(vocabulary, size=rng.integers(3, 7))) for _ in range(count)
+    ]
+    return TfidfVectorizer().fit_transform(texts)
+
+
+@pytest.mark.parametrize("keep", ["first", "last"])
+@pytest.mark.parametrize("block_size", [1, 7, 1024])
+def test_greedy_sparse_deduplicate_matches_pairwise_pass(keep, block_size):
+    matrix = _tfidf_matrix(300)
+    expected = _naive_deduplicate((matrix @ matrix.T).toarray(), 0.8, keep)
+
+    kept = greedy_sparse_deduplicate(matrix, 0.8, keep=keep, block_size=block_size)
+
+    assert 0 < len(expected) < matrix.shape[0]
+    assert kept.tolist() == expected
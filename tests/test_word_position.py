@@ -0,0 +1,76 @@
+import pytest
+
+from synda.pipeline.metadata.word_position import WordPosition
+from synda.utils.aho_corasick import AhoCorasick
+from synda.utils.text import fold_text
+
+
+def _naive_occurrences(text: str, patterns: list[str]) -> list[tuple[int, int]]:
+    return sorted(
+        (start, index)
+        for index, pattern in enumerate(patterns)
+        for start in range(len(text))
+        if pattern and text.startswith(pattern, start)
+    )
+
+
+@pytest.mark.parametrize(
+    "text, patterns",
+    [
+        ("ushers said she has his hershey", ["he", "she", "his", "hers", "e"]),
+        ("aaaaab", ["a", "aa", "aaa", "ab", "b"]),
+        ("abcabcabd", ["abcabd", "bca", "cab", "abc"]),
+        ("no match here", ["xyz", "", "qq"]),
+    ],
+)
+def test_aho_corasick_finds_overlapping_occurrences(text, patterns):
+    occurrences = list(AhoCorasick(patterns).iter(text))
+
+    assert sorted(occurrences) == _naive_occurrences(text, patterns)
+    # Ordered by end offset
+    ends = [start + len(patterns[index]) for start, index in occurrences]
+    assert ends == sorted(ends)
+
+
+def _matched_values(text: str, patterns: list[str], all_occurrences: bool):
+    folded = tuple(fold_text(pattern)[0] for pattern in patterns)
+    matches = WordPosition._find_matches(text, folded, all_occurrences)
+    return [[text[start:end] for start, end in label] for label in matches]
+
+
+def test_folded_matches_map_back_to_original_offsets():
+    text = "Le Café de l'ÉLYSÉE, près de la Straße et de la strasse."
+
+    assert _matched_values(text, ["cafe", "Élysée", "strasse"], True) == [
+        ["Café"],
+        ["ÉLYSÉE"],
+        ["Straße", "strasse"],
+    ]
+
+
+def test_character_folding_to_several_characters_ends_on_it():
+    # "ß" folds to "ss": a match ending inside it still covers it
+    text = "Große Straße"
+
+    assert _matched_values(text, ["grosse", "stras"], True) == [
+        ["Große"],
+        ["Straß"],
+    ]
+
+
+def test_overlapping_occurrences_of_one_pattern_are_skipped():
+    text = "Ééééé"
+
+    assert _matched_values(text, ["ee"], True) == [["Éé", "éé"]]
+    assert _matched_values(text, ["ee"], False) == [["Éé"]]
+
+
+def test_overlapping_patterns_are_matched_independently():
+    text = "She moved to New York, then to York."
+
+    assert _matched_values(text, ["new york", "york", "she", "he"], True) == [
+        ["New York"],
+        ["York", "York"],
+        ["She"],
+        ["he", "he"],
+    ]